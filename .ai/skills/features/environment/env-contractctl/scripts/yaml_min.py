@@ -14,7 +14,8 @@ Determinism note:
 - By default, this module uses the minimal parser even if PyYAML is installed.
   This prevents "works on my machine" YAML (PyYAML) from breaking in agent/CI
   environments that only support the strict subset.
-- You can opt in to PyYAML parsing by setting `YAML_MIN_USE_PYYAML=1`.
+- You can opt in to PyYAML parsing by setting `YAML_MIN_USE_PYYAML=1`
+  (uses the libyaml `CSafeLoader` when available, else `SafeLoader`).
 
 This module intentionally does NOT implement the full YAML spec.
 """
@@ -44,8 +45,10 @@ def safe_load(text: str) -> Any:
         try:
             import yaml  # type: ignore
 
+            # Prefer the libyaml-backed loader when PyYAML was built with it.
+            loader = getattr(yaml, "CSafeLoader", None) or yaml.SafeLoader
             try:
-                return yaml.safe_load(text)
+                return yaml.load(text, Loader=loader)
             except Exception as e:  # noqa: BLE001
                 raise YamlError(f"PyYAML failed to parse YAML: {e}")
         except ModuleNotFoundError:
@@ -5,6 +5,7 @@ Subcommands:
   - doctor: validate required files and required keys for an env; check secret material resolvability.
   - compile: resolve secrets and generate `.env.local` (or `.env.<env>.local`) and redacted effective context JSON.
   - connectivity: best-effort parse/TCP checks for configured URL endpoints (redacted output).
+  - all: doctor + compile + connectivity in one process (one resolution); `--out-dir` writes all three reports.
 
 Design goals:
   - Never print secret values.
@@ -19,6 +20,9 @@ Exit codes:
 from __future__ import annotations
 
 import argparse
+import copy
+import functools
+import hashlib
 import json
 import os
 import re
@@ -27,24 +31,36 @@ import socket
 import stat
 import subprocess
 import sys
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
-from urllib.parse import parse_qs, urlparse
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+from urllib.parse import parse_qs, unquote_plus, urlparse
 
 import yaml_min
 
+try:
+    # Optional accelerator; stdlib json is used when unavailable (e.g. under `python3 -S`).
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore
+
 ALLOWED_TYPES = {"string", "int", "float", "bool", "json", "enum", "url"}
 LIFECYCLE_STATES = {"active", "deprecated", "removed"}
-_DATE_YYYY_MM_DD_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
-ENV_VAR_RE = re.compile(r"^[A-Z][A-Z0-9_]*$")
+# Both patterns are applied with fullmatch(), so no anchors are needed (and a
+# trailing newline cannot slip past a `$`).
+_DATE_YYYY_MM_DD_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+ENV_VAR_RE = re.compile(r"[A-Z][A-Z0-9_]*")
 
 AUTH_MODES = {"role-only", "auto", "ak-only"}
 PREFLIGHT_MODES = {"fail", "warn", "off"}
 
 _BWS_PROJECT_ID_CACHE: Dict[str, str] = {}
 _BWS_SECRETS_CACHE: Dict[str, Dict[str, str]] = {}
+# `bws project list` results (ids/names only, never secret values) are cached on disk.
+_BWS_PROJECTS_CACHE_TTL_S = 300
 
 
 def normalize_runtime_target(value: str) -> str:
@@ -59,10 +75,74 @@ def utc_now_iso() -> str:
     return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
 
+_NATIVE_NEWLINE = os.linesep.encode("ascii")
+
+
+def _native_newlines(data: bytes) -> bytes:
+    """Translate LF the way a text-mode write does (CRLF on Windows); unchanged elsewhere."""
+    return data if _NATIVE_NEWLINE == b"\n" else data.replace(b"\n", _NATIVE_NEWLINE)
+
+
+def _orjson_faithful(obj: Any) -> bool:
+    """True when orjson would encode `obj` exactly like stdlib json.
+
+    Floats are the difference (`1.5e+20` vs `1.5e20`, NaN -> null), so any float sends
+    the document to stdlib json; everything orjson cannot encode raises TypeError.
+    """
+    stack = [obj]
+    while stack:
+        cur = stack.pop()
+        if isinstance(cur, float):
+            return False
+        if isinstance(cur, dict):
+            stack.extend(cur.values())
+        elif isinstance(cur, (list, tuple)):
+            stack.extend(cur)
+    return True
+
+
+def _dumps_pretty_bytes(obj: Any) -> bytes:
+    """Indented, key-sorted JSON (json.dumps(indent=2, sort_keys=True) layout) plus a newline, as UTF-8 bytes."""
+    if orjson is not None and _orjson_faithful(obj):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            # Non-str keys, very large ints, ...: let stdlib json handle it.
+            pass
+    return (json.dumps(obj, indent=2, sort_keys=True, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _loads_json_bytes(data: bytes) -> Any:
+    """Parse JSON straight from UTF-8 bytes (no intermediate str when orjson is available)."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            # NaN/Infinity and other stdlib-only inputs; stdlib json re-raises if truly invalid.
+            pass
+    return json.loads(data)
+
+
+def _dumps_compact(obj: Any) -> str:
+    if orjson is not None and _orjson_faithful(obj):
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
 def read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8")
 
 
+def _decode_tail(data: Optional[bytes], limit: int = 4096) -> str:
+    """Decode (leniently) and strip only the last `limit` bytes of a captured stream."""
+    if not data:
+        return ""
+    return data[-limit:].decode("utf-8", errors="replace").strip()
+
+
 def _run_cli_json(
     args: Sequence[str],
     *,
@@ -74,47 +154,116 @@ def _run_cli_json(
     Important: callers must ensure secret values are not printed/logged.
     """
     try:
-        proc = subprocess.run(
-            list(args),
-            check=False,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-        )
+        # Raw bytes: the JSON is parsed directly and only the tail of an error stream is decoded.
+        proc = subprocess.run(list(args), check=False, capture_output=True)
     except FileNotFoundError:
         return None, f"{name} not found in PATH: {args[0]!r}"
     except Exception as e:
         return None, f"failed to run {name}: {e}"
 
     if proc.returncode != 0:
-        stderr = (proc.stderr or "").strip()
-        stdout = (proc.stdout or "").strip() if allow_stdout_in_error else ""
+        stderr = _decode_tail(proc.stderr)
+        stdout = _decode_tail(proc.stdout) if allow_stdout_in_error else ""
         details = stderr if stderr else stdout
         details = details.splitlines()[-1] if details else f"exit={proc.returncode}"
         return None, f"{name} failed: {details}"
 
     try:
-        return json.loads(proc.stdout), None
+        return _loads_json_bytes(proc.stdout), None
     except Exception as e:
         return None, f"{name} returned invalid JSON: {e}"
 
 
+# PATH lookup and token probe are resolved once per process (reset with .cache_clear()).
+@functools.lru_cache(maxsize=1)
 def _bws_bin() -> Optional[str]:
     return shutil.which("bws")
 
 
+@functools.lru_cache(maxsize=1)
+def _bws_token_present() -> bool:
+    return bool(os.environ.get("BWS_ACCESS_TOKEN"))
+
+
+def _bws_cache_ttl_s() -> int:
+    raw = os.environ.get("ENV_LOCALCTL_BWS_CACHE_TTL")
+    if raw is None or not raw.strip():
+        return _BWS_PROJECTS_CACHE_TTL_S
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return _BWS_PROJECTS_CACHE_TTL_S
+
+
+def _bws_disk_cache_path(token: str) -> Path:
+    # Key by a hash of the access token so different machine accounts never share entries.
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    digest = hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+    return Path(base) / "env-localctl" / f"bws-projects-{digest}.json"
+
+
+def _bws_read_projects_cache(token: str) -> Optional[List[Mapping[str, Any]]]:
+    ttl = _bws_cache_ttl_s()
+    if ttl <= 0:
+        return None
+    path = _bws_disk_cache_path(token)
+    try:
+        if path.stat().st_mtime < time.time() - ttl:
+            return None
+        data = load_json(path)
+    except Exception:
+        return None
+    return data if isinstance(data, list) else None
+
+
+def _bws_write_projects_cache(token: str, projects: Sequence[Any]) -> None:
+    """Best-effort atomic write of project ids/names (0600; no secret values)."""
+    if _bws_cache_ttl_s() <= 0:
+        return
+    slim = [
+        {"id": p.get("id"), "name": p.get("name")}
+        for p in projects
+        if isinstance(p, dict)
+    ]
+    _atomic_write_cache(_bws_disk_cache_path(token), json.dumps(slim).encode("utf-8"))
+
+
+def _atomic_write_cache(path: Path, data: bytes) -> None:
+    """Best-effort atomic write of a cache file (mkstemp => 0600); failures are ignored."""
+    tmp: Optional[str] = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.stem}-", suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+        tmp = None
+    except Exception:
+        pass
+    finally:
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
 def _bws_projects() -> Tuple[Optional[List[Mapping[str, Any]]], Optional[str]]:
     bws = _bws_bin()
     if not bws:
         return None, "bws CLI not found in PATH (install Bitwarden Secrets Manager CLI)"
-    if not os.environ.get("BWS_ACCESS_TOKEN"):
+    if not _bws_token_present():
         return None, "BWS_ACCESS_TOKEN is not set (export your Bitwarden Secrets Manager access token)"
+    token = os.environ.get("BWS_ACCESS_TOKEN", "")
+    cached = _bws_read_projects_cache(token)
+    if cached is not None:
+        return cached, None
     data, err = _run_cli_json([bws, "project", "list", "--output", "json", "--color", "no"], name="bws project list")
     if err:
         return None, err
     if not isinstance(data, list):
         return None, "bws project list: expected JSON array"
+    _bws_write_projects_cache(token, data)
     return data, None
 
 
@@ -154,7 +303,7 @@ def _bws_secrets_for_project(project_id: str) -> Tuple[Optional[Dict[str, str]],
     bws = _bws_bin()
     if not bws:
         return None, "bws CLI not found in PATH (install Bitwarden Secrets Manager CLI)"
-    if not os.environ.get("BWS_ACCESS_TOKEN"):
+    if not _bws_token_present():
         return None, "BWS_ACCESS_TOKEN is not set (export your Bitwarden Secrets Manager access token)"
     data, err = _run_cli_json(
         [bws, "secret", "list", pid, "--output", "json", "--color", "no"],
@@ -182,8 +331,200 @@ def _bws_secrets_for_project(project_id: str) -> Tuple[Optional[Dict[str, str]],
     return out, None
 
 
+def _bws_prefetch(project_ids: Iterable[str]) -> None:
+    """Warm the in-memory secrets cache for several projects concurrently.
+
+    Each `bws secret list` is a separate process launch + auth round-trip, so
+    running them in parallel turns N launch latencies into ~1. Errors are
+    ignored here; resolve_secret re-reports them per secret.
+    """
+    pending = sorted({pid.strip() for pid in project_ids if pid and pid.strip()} - set(_BWS_SECRETS_CACHE))
+    if len(pending) < 2:
+        return
+    with ThreadPoolExecutor(max_workers=min(8, len(pending))) as ex:
+        list(ex.map(_bws_secrets_for_project, pending))
+
+
+def _parse_bws_ref(ref: str) -> Tuple[Optional[str], Optional[str]]:
+    """Split `bws://<PROJECT_ID>?key=<SECRET_KEY>` into (project_id, key)."""
+    if not ref.startswith("bws://"):
+        return None, None
+    body = ref[len("bws://") :]
+    # Anything unusual (paths, fragments, `;`/`+`, brackets, tab/CR/LF, repeated key=) goes through urllib for identical semantics.
+    if any(c in body for c in "/#;+[]\t\r\n") or body.count("key=") > 1:
+        u = urlparse(ref)
+        k = parse_qs(u.query or "").get("key", [None])[0]
+        return u.netloc, k
+    project_id, _, query = body.partition("?")
+    key: Optional[str] = None
+    for kv in query.split("&"):
+        k, _, v = kv.partition("=")
+        if k == "key" and v:
+            key = unquote_plus(v)
+            break
+    return project_id, key
+
+
+def _bws_locate(
+    secret_cfg: Mapping[str, Any],
+    policy_bws: Optional[Mapping[str, Any]],
+) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Return (project_id, project_name, key) for a bws secret ref (policy defaults applied)."""
+    ref = str(secret_cfg.get("ref", "")).strip()
+    cfg = _apply_bws_defaults(secret_cfg, policy_bws or {})
+    project_id = cfg.get("project_id")
+    project_name = cfg.get("project_name")
+    key = cfg.get("key")
+
+    if (not project_id or not isinstance(project_id, str)) and ref.startswith("bws://"):
+        project_id, k = _parse_bws_ref(ref)
+        if isinstance(k, str) and k.strip():
+            key = k.strip()
+
+    return (
+        project_id.strip() if isinstance(project_id, str) and project_id.strip() else None,
+        project_name if isinstance(project_name, str) and project_name.strip() else None,
+        key.strip() if isinstance(key, str) and key.strip() else None,
+    )
+
+
+def _bws_prefetch_for_refs(
+    secrets_ref: Mapping[str, Mapping[str, Any]],
+    ref_names: Iterable[str],
+    *,
+    policy_bws: Optional[Mapping[str, Any]] = None,
+) -> None:
+    """Prefetch every bws project referenced by `ref_names` before per-secret resolution."""
+    project_ids: Set[str] = set()
+    for ref_name in ref_names:
+        cfg = secrets_ref.get(ref_name)
+        if not isinstance(cfg, dict) or str(cfg.get("backend", "")).strip() != "bws":
+            continue
+        pid, project_name, _key = _bws_locate(cfg, policy_bws)
+        if pid is None and project_name is not None:
+            pid, _err = _bws_project_id_by_name(project_name)
+        if pid:
+            project_ids.add(pid)
+    _bws_prefetch(project_ids)
+
+
+# Opt-in on-disk cache of parsed YAML as JSON (--cache-dir / ENV_LOCALCTL_CACHE_DIR).
+_YAML_JSON_CACHE_DIR: Optional[Path] = None
+_JSON_CACHE_VERSION = 1
+_INT64_MIN, _INT64_MAX = -(2**63), 2**63 - 1
+# Disk-cache lookups for --debug-cache; in-process hits never reach the disk cache.
+_YAML_JSON_CACHE_STATS: Dict[str, int] = {"hits": 0, "misses": 0}
+
+
+def set_yaml_json_cache_dir(path: Optional[Path]) -> None:
+    global _YAML_JSON_CACHE_DIR
+    _YAML_JSON_CACHE_DIR = path
+    _load_yaml_cached.cache_clear()
+
+
+def _yaml_parser_tag() -> str:
+    # Cached documents are only valid for the parser that produced them (see yaml_min.safe_load).
+    use_pyyaml = str(os.getenv("YAML_MIN_USE_PYYAML", "")).strip().lower() in {"1", "true", "yes", "on"}
+    return "pyyaml" if use_pyyaml else "yaml_min"
+
+
+def _json_faithful(obj: Any) -> bool:
+    """True if a JSON round trip gives back an equal document of the same types."""
+    if obj is None or isinstance(obj, (str, bool)):
+        return True
+    if isinstance(obj, int):
+        return _INT64_MIN <= obj <= _INT64_MAX
+    if isinstance(obj, float):
+        return obj == obj and obj not in (float("inf"), float("-inf"))
+    if isinstance(obj, list):
+        return all(_json_faithful(v) for v in obj)
+    if isinstance(obj, dict):
+        return all(isinstance(k, str) and _json_faithful(v) for k, v in obj.items())
+    return False
+
+
+def _yaml_json_cache_path(cache_dir: Path, path_str: str) -> Path:
+    # One entry per source file, overwritten when the file changes.
+    return cache_dir / f"yaml-{hashlib.sha256(path_str.encode('utf-8')).hexdigest()[:32]}.json"
+
+
+def _read_yaml_json_cache(cache_path: Path, path_str: str, mtime_ns: int, size: int) -> Tuple[bool, Any]:
+    try:
+        rec = _loads_json_bytes(cache_path.read_bytes())
+    except Exception:
+        return False, None
+    if (
+        isinstance(rec, dict)
+        and rec.get("v") == _JSON_CACHE_VERSION
+        and rec.get("parser") == _yaml_parser_tag()
+        and rec.get("path") == path_str
+        and rec.get("mtime_ns") == mtime_ns
+        and rec.get("size") == size
+        and "doc" in rec
+    ):
+        return True, rec["doc"]
+    return False, None
+
+
+class _StaleStat(Exception):
+    """The file changed between stat() and open(); the caller retries with a fresh stat."""
+
+
+def _read_bytes_if_unchanged(path_str: str, mtime_ns: int, size: int) -> bytes:
+    # Single open + fstat on the same fd: the bytes are guaranteed to match the cache key.
+    with open(path_str, "rb") as fh:
+        st = os.fstat(fh.fileno())
+        if st.st_mtime_ns != mtime_ns or st.st_size != size:
+            raise _StaleStat(path_str)
+        return fh.read()
+
+
+def _parse_yaml_bytes(data: bytes) -> Any:
+    # yaml_min splits with str.splitlines(), so CRLF input parses the same as with read_text().
+    return yaml_min.safe_load(data.decode("utf-8"))
+
+
+@functools.lru_cache(maxsize=256)
+def _load_yaml_cached(path_str: str, mtime_ns: int, size: int) -> Any:
+    # mtime_ns/size only key the cache: an edited file gets a fresh entry.
+    cache_dir = _YAML_JSON_CACHE_DIR
+    if cache_dir is None:
+        return _parse_yaml_bytes(_read_bytes_if_unchanged(path_str, mtime_ns, size))
+
+    cache_path = _yaml_json_cache_path(cache_dir, path_str)
+    hit, doc = _read_yaml_json_cache(cache_path, path_str, mtime_ns, size)
+    _YAML_JSON_CACHE_STATS["hits" if hit else "misses"] += 1
+    if hit:
+        return doc
+    doc = _parse_yaml_bytes(_read_bytes_if_unchanged(path_str, mtime_ns, size))
+    if _json_faithful(doc):
+        rec = {
+            "v": _JSON_CACHE_VERSION,
+            "parser": _yaml_parser_tag(),
+            "path": path_str,
+            "mtime_ns": mtime_ns,
+            "size": size,
+            "doc": doc,
+        }
+        _atomic_write_cache(cache_path, _dumps_compact(rec).encode("utf-8"))
+    return doc
+
+
 def load_yaml(path: Path) -> Any:
-    return yaml_min.safe_load(read_text(path))
+    """Parse a YAML file, reusing the parsed document while the file is unchanged.
+
+    Returns a deep copy so callers may mutate the result without poisoning the cache.
+    """
+    path_str = str(path)
+    for _attempt in range(3):
+        st = os.stat(path_str)
+        try:
+            return copy.deepcopy(_load_yaml_cached(path_str, st.st_mtime_ns, st.st_size))
+        except _StaleStat:
+            continue
+    # Still being rewritten: parse what is there now without caching it.
+    with open(path_str, "rb") as fh:
+        return _parse_yaml_bytes(fh.read())
 
 
 def load_json(path: Path) -> Any:
@@ -192,11 +533,10 @@ def load_json(path: Path) -> Any:
 
 def get_ssot_mode(root: Path) -> Optional[str]:
     gate = root / "docs" / "project" / "env-ssot.json"
-    if not gate.exists():
-        return None
     try:
         data = load_json(gate)
     except Exception:
+        # Missing or unreadable gate file.
         return None
     if isinstance(data, dict):
         for k in ("mode", "env_ssot", "ssot_mode"):
@@ -227,11 +567,11 @@ def _env_var_present(name: str) -> bool:
 def load_policy(path: Path) -> Tuple[Optional[Dict[str, Any]], List[str], List[str]]:
     warnings: List[str] = []
     errors: List[str] = []
-    if not path.exists():
-        warnings.append(f"Policy file missing: {path}")
-        return None, warnings, errors
     try:
         data = load_yaml(path)
+    except (FileNotFoundError, NotADirectoryError):
+        warnings.append(f"Policy file missing: {path}")
+        return None, warnings, errors
     except Exception as e:
         errors.append(f"Failed to parse policy file {path}: {e}")
         return None, warnings, errors
@@ -287,11 +627,10 @@ def _apply_bws_defaults(meta: Mapping[str, Any], defaults: Mapping[str, Any]) ->
 
 
 def load_policy_bws_defaults(path: Path) -> Mapping[str, Any]:
-    if not path.exists():
-        return {}
     try:
         data = load_yaml(path)
     except Exception:
+        # Missing or unparsable policy: no bws defaults.
         return {}
     if not isinstance(data, dict):
         return {}
@@ -506,7 +845,7 @@ def write_fallback_evidence(root: Path, base_dir: str, payload: Mapping[str, Any
     out_dir = base / run_id
     out_dir.mkdir(parents=True, exist_ok=True)
     path = out_dir / "fallback.json"
-    path.write_text(json.dumps(payload, indent=2, sort_keys=True, ensure_ascii=False) + "\n", encoding="utf-8")
+    path.write_bytes(_native_newlines(_dumps_pretty_bytes(payload)))
     return str(path)
 
 
@@ -635,8 +974,25 @@ def evaluate_preflight(
     )
 
 
-@dataclass
+@dataclass(frozen=True)
 class VarDef:
+    # Explicit __slots__ (dataclass(slots=True) needs Python 3.10+): no per-instance __dict__.
+    __slots__ = (
+        "name",
+        "type",
+        "required",
+        "secret",
+        "secret_ref",
+        "default",
+        "enum",
+        "scopes",
+        "description",
+        "state",
+        "deprecate_after",
+        "replacement",
+        "rename_from",
+    )
+
     name: str
     type: str
     required: bool
@@ -652,26 +1008,127 @@ class VarDef:
     rename_from: Optional[str]
 
 
-def parse_contract(root: Path) -> Tuple[Dict[str, VarDef], List[str]]:
-    """Return (vars, errors)."""
-    errors: List[str] = []
-    contract_path = root / "env" / "contract.yaml"
-    if not contract_path.exists():
-        return {}, [f"Missing contract: {contract_path}"]
+_LIFECYCLE_KEYS = frozenset({"state", "deprecated", "deprecate_after", "replacement", "replaced_by", "migration"})
+
+
+def _parse_lifecycle(
+    name: str,
+    cfg: Mapping[str, Any],
+    errors: List[str],
+) -> Tuple[str, Optional[str], Optional[str], Optional[str]]:
+    """Validate lifecycle fields; return (state, deprecate_after, replacement, rename_from)."""
+    # Lifecycle (backward compatible):
+    # - preferred: state: active|deprecated|removed
+    # - legacy: deprecated: true
+    state_raw = cfg.get("state")
+    deprecated_raw = cfg.get("deprecated")
+    state: str
+    if isinstance(state_raw, str) and state_raw.strip():
+        state = state_raw.strip()
+    elif deprecated_raw is True:
+        state = "deprecated"
+    else:
+        state = "active"
+    if state not in LIFECYCLE_STATES:
+        errors.append(f"Variable {name}: invalid state {state!r} (allowed: {sorted(LIFECYCLE_STATES)})")
+        state = "active"
+    if deprecated_raw is True and state != "deprecated":
+        errors.append(f"Variable {name}: deprecated=true conflicts with state={state!r}")
+
+    deprecate_after = cfg.get("deprecate_after")
+    if deprecate_after is not None:
+        if not isinstance(deprecate_after, str) or not _DATE_YYYY_MM_DD_RE.fullmatch(deprecate_after.strip()):
+            errors.append(f"Variable {name}: deprecate_after must be YYYY-MM-DD if present")
+            deprecate_after = None
+        else:
+            deprecate_after = deprecate_after.strip()
+        if state != "deprecated":
+            errors.append(f"Variable {name}: deprecate_after is only valid when state='deprecated'")
+            deprecate_after = None
+
+    replacement = cfg.get("replacement")
+    replaced_by = cfg.get("replaced_by")
+    if replacement is None and replaced_by is not None:
+        replacement = replaced_by
+    if replacement is not None:
+        if not isinstance(replacement, str) or not ENV_VAR_RE.fullmatch(replacement):
+            errors.append(f"Variable {name}: replacement must be a valid env var name")
+            replacement = None
+        if state != "deprecated":
+            errors.append(f"Variable {name}: replacement is only valid when state='deprecated'")
+            replacement = None
+
+    rename_from: Optional[str] = None
+    migration = cfg.get("migration")
+    if migration is not None:
+        if not isinstance(migration, dict):
+            errors.append(f"Variable {name}: migration must be a mapping if present")
+        else:
+            rf = migration.get("rename_from")
+            if rf is not None:
+                if not isinstance(rf, str) or not ENV_VAR_RE.fullmatch(rf):
+                    errors.append(f"Variable {name}: migration.rename_from must be a valid env var name")
+                elif rf == name:
+                    errors.append(f"Variable {name}: migration.rename_from must not equal the variable name")
+                else:
+                    rename_from = rf
+
+    return (
+        state,
+        deprecate_after if isinstance(deprecate_after, str) else None,
+        replacement if isinstance(replacement, str) else None,
+        rename_from,
+    )
+
 
+def _str_list(v: Any) -> Optional[List[str]]:
+    """Return a copy of `v` if it is a list of strings, else None."""
+    if isinstance(v, list) and all(isinstance(x, str) for x in v):
+        return list(v)
+    return None
+
+
+def parse_contract(root: Path) -> Tuple[Dict[str, VarDef], List[str], Dict[str, str]]:
+    """Return (vars, errors, rename_map) where rename_map is migration.rename_from -> new name.
+
+    Parsing + validation is memoised per (contract path, mtime, size); callers get fresh
+    containers, while the frozen VarDef entries are shared and must be treated as read-only.
+    """
+    contract_path = root / "env" / "contract.yaml"
+    try:
+        st = contract_path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return {}, [f"Missing contract: {contract_path}"], {}
+    vars_out, errors, rename_map = _parse_contract_cached(str(contract_path), st.st_mtime_ns, st.st_size)
+    return dict(vars_out), list(errors), dict(rename_map)
+
+
+@functools.lru_cache(maxsize=16)
+def _parse_contract_cached(
+    path_str: str, mtime_ns: int, size: int
+) -> Tuple[Dict[str, VarDef], List[str], Dict[str, str]]:
+    # mtime_ns/size only key the cache (see _load_yaml_cached).
+    errors: List[str] = []
+    contract_path = Path(path_str)
     try:
         doc = load_yaml(contract_path)
+    except (FileNotFoundError, NotADirectoryError):
+        return {}, [f"Missing contract: {contract_path}"], {}
     except Exception as e:
-        return {}, [f"Failed to parse contract YAML: {e}"]
+        return {}, [f"Failed to parse contract YAML: {e}"], {}
 
     if not isinstance(doc, dict) or "variables" not in doc or not isinstance(doc.get("variables"), dict):
-        return {}, ["Contract must be a mapping with top-level 'variables' mapping."]
+        return {}, ["Contract must be a mapping with top-level 'variables' mapping."], {}
 
     raw_vars: Mapping[str, Any] = doc["variables"]
     vars_out: Dict[str, VarDef] = {}
+    # Built alongside vars_out; collisions are reported after the per-variable errors.
+    rename_from_to: Dict[str, str] = {}
+    rename_errors: List[str] = []
+    is_env_var = ENV_VAR_RE.fullmatch
 
     for name, cfg in raw_vars.items():
-        if not isinstance(name, str) or not ENV_VAR_RE.match(name):
+        if not isinstance(name, str) or not is_env_var(name):
             errors.append(f"Invalid env var name in contract: {name!r}")
             continue
         if not isinstance(cfg, dict):
@@ -683,61 +1140,17 @@ def parse_contract(root: Path) -> Tuple[Dict[str, VarDef], List[str]]:
             errors.append(f"Variable {name}: invalid type {vtype!r} (allowed: {sorted(ALLOWED_TYPES)})")
             continue
 
-        # Lifecycle (backward compatible):
-        # - preferred: state: active|deprecated|removed
-        # - legacy: deprecated: true
-        state_raw = cfg.get("state")
-        deprecated_raw = cfg.get("deprecated")
-        state: str
-        if isinstance(state_raw, str) and state_raw.strip():
-            state = state_raw.strip()
-        elif deprecated_raw is True:
-            state = "deprecated"
+        if cfg.keys().isdisjoint(_LIFECYCLE_KEYS):
+            # Common case: a plain active variable with no lifecycle fields to validate.
+            state, deprecate_after, replacement, rename_from = "active", None, None, None
         else:
-            state = "active"
-        if state not in LIFECYCLE_STATES:
-            errors.append(f"Variable {name}: invalid state {state!r} (allowed: {sorted(LIFECYCLE_STATES)})")
-            state = "active"
-        if deprecated_raw is True and state != "deprecated":
-            errors.append(f"Variable {name}: deprecated=true conflicts with state={state!r}")
-
-        deprecate_after = cfg.get("deprecate_after")
-        if deprecate_after is not None:
-            if not isinstance(deprecate_after, str) or not _DATE_YYYY_MM_DD_RE.match(deprecate_after.strip()):
-                errors.append(f"Variable {name}: deprecate_after must be YYYY-MM-DD if present")
-                deprecate_after = None
-            else:
-                deprecate_after = deprecate_after.strip()
-            if state != "deprecated":
-                errors.append(f"Variable {name}: deprecate_after is only valid when state='deprecated'")
-                deprecate_after = None
-
-        replacement = cfg.get("replacement")
-        replaced_by = cfg.get("replaced_by")
-        if replacement is None and replaced_by is not None:
-            replacement = replaced_by
-        if replacement is not None:
-            if not isinstance(replacement, str) or not ENV_VAR_RE.match(replacement):
-                errors.append(f"Variable {name}: replacement must be a valid env var name")
-                replacement = None
-            if state != "deprecated":
-                errors.append(f"Variable {name}: replacement is only valid when state='deprecated'")
-                replacement = None
-
-        rename_from: Optional[str] = None
-        migration = cfg.get("migration")
-        if migration is not None:
-            if not isinstance(migration, dict):
-                errors.append(f"Variable {name}: migration must be a mapping if present")
+            state, deprecate_after, replacement, rename_from = _parse_lifecycle(name, cfg, errors)
+        if rename_from is not None:
+            prev = rename_from_to.get(rename_from)
+            if prev is not None and prev != name:
+                rename_errors.append(f"Contract rename_from collision: {rename_from} -> {prev} and {name}")
             else:
-                rf = migration.get("rename_from")
-                if rf is not None:
-                    if not isinstance(rf, str) or not ENV_VAR_RE.match(rf):
-                        errors.append(f"Variable {name}: migration.rename_from must be a valid env var name")
-                    elif rf == name:
-                        errors.append(f"Variable {name}: migration.rename_from must not equal the variable name")
-                    else:
-                        rename_from = rf
+                rename_from_to[rename_from] = name
 
         required = bool(cfg.get("required", False))
         secret = bool(cfg.get("secret", False))
@@ -753,156 +1166,145 @@ def parse_contract(root: Path) -> Tuple[Dict[str, VarDef], List[str]]:
                 errors.append(f"Variable {name}: non-secret variables must not set secret_ref")
 
         default = cfg.get("default")
-        enum_vals = cfg.get("enum")
         enum_list: Optional[List[str]] = None
         if vtype == "enum":
-            if not isinstance(enum_vals, list) or not enum_vals or not all(isinstance(x, str) for x in enum_vals):
+            enum_list = _str_list(cfg.get("enum")) or None
+            if enum_list is None:
                 errors.append(f"Variable {name}: enum type requires non-empty string list 'enum'")
-            else:
-                enum_list = list(enum_vals)
 
         scopes_vals = cfg.get("scopes")
         scopes: Optional[List[str]] = None
         if scopes_vals is not None:
-            if not isinstance(scopes_vals, list) or not all(isinstance(x, str) for x in scopes_vals):
+            scopes = _str_list(scopes_vals)
+            if scopes is None:
                 errors.append(f"Variable {name}: scopes must be a list of env names")
-            else:
-                scopes = list(scopes_vals)
 
         description = cfg.get("description")
         if not isinstance(description, str) or not description.strip() or "\n" in description:
             errors.append(f"Variable {name}: description must be a non-empty single line")
             description = (description or "").replace("\n", " ").strip()
 
+        # Positional, in VarDef field order (skips keyword binding on the per-variable hot path).
         vars_out[name] = VarDef(
-            name=name,
-            type=vtype,
-            required=required,
-            secret=secret,
-            secret_ref=secret_ref if isinstance(secret_ref, str) else None,
-            default=default,
-            enum=enum_list,
-            scopes=scopes,
-            description=description,
-            state=state,
-            deprecate_after=deprecate_after if isinstance(deprecate_after, str) else None,
-            replacement=replacement if isinstance(replacement, str) else None,
-            rename_from=rename_from,
+            name,
+            vtype,
+            required,
+            secret,
+            secret_ref if isinstance(secret_ref, str) else None,
+            default,
+            enum_list,
+            scopes,
+            description,
+            state,
+            deprecate_after,
+            replacement,
+            rename_from,
         )
 
-    # Validate rename_from mapping collisions / conflicts.
-    rename_from_to: Dict[str, str] = {}
-    for new_name, vdef in vars_out.items():
-        if not vdef.rename_from:
-            continue
-        old = vdef.rename_from
-        if old in rename_from_to and rename_from_to[old] != new_name:
-            errors.append(f"Contract rename_from collision: {old} -> {rename_from_to[old]} and {new_name}")
-        else:
-            rename_from_to[old] = new_name
-
+    errors.extend(rename_errors)
+    # The old name may be defined anywhere in the contract, so check once vars_out is complete.
     for old, new in rename_from_to.items():
         old_def = vars_out.get(old)
         if old_def and old_def.state != "removed":
             errors.append(f"Contract rename_from conflict: {new} declares rename_from={old} but {old} exists and is not state='removed'")
 
-    return vars_out, errors
+    return vars_out, errors, rename_from_to
 
 
-def _rename_from_map(vars_def: Mapping[str, VarDef]) -> Dict[str, str]:
-    return {v.rename_from: v.name for v in vars_def.values() if v.rename_from}
-
-
-def canonicalize_values_for_env(
+def canonicalize_values_sources(
     vars_def: Mapping[str, VarDef],
-    raw_values: Mapping[str, Any],
+    sources: Sequence[Tuple[Mapping[str, Any], Path]],
     *,
     env: str,
-    source_path: Path,
-) -> Tuple[Dict[str, Any], List[str], List[str]]:
-    """Canonicalize values file keys using contract migration.rename_from.
+    rename_map: Mapping[str, str],
+) -> Tuple[List[Tuple[str, Any, Path]], List[str], List[str]]:
+    """Canonicalize several values files in one pass.
 
-    Returns (canonical_values, errors, warnings).
+    Returns (entries, errors, warnings) where entries lists every accepted
+    (canonical_key, value, source_path) in source and file order, so callers can check each
+    file's value and let later sources win. Legacy/new key conflicts are per file.
     """
     errors: List[str] = []
     warnings: List[str] = []
-    out: Dict[str, Any] = {}
-
-    rename_map = _rename_from_map(vars_def)
-
-    for k, v in raw_values.items():
-        if k in vars_def:
-            vdef = vars_def[k]
-            if not applicable(vdef, env):
-                errors.append(f"Out-of-scope key in values file {source_path}: {k} (env={env})")
-                continue
-            if vdef.state == "removed":
-                errors.append(f"Removed contract key set in values file {source_path}: {k}")
-                continue
-            if vdef.secret:
-                errors.append(f"Values file must not include secret variable {k}: {source_path}")
+    entries: List[Tuple[str, Any, Path]] = []
+    vars_def_get = vars_def.get
+    rename_map_get = rename_map.get
+
+    for raw_values, source_path in sources:
+        for k, v in raw_values.items():
+            vdef = vars_def_get(k)
+            if vdef is not None:
+                if not applicable(vdef, env):
+                    errors.append(f"Out-of-scope key in values file {source_path}: {k} (env={env})")
+                    continue
+                if vdef.state == "removed":
+                    errors.append(f"Removed contract key set in values file {source_path}: {k}")
+                    continue
+                if vdef.secret:
+                    errors.append(f"Values file must not include secret variable {k}: {source_path}")
+                    continue
+                if vdef.state == "deprecated":
+                    msg = f"Deprecated contract key used in values file {source_path}: {k}"
+                    if vdef.deprecate_after:
+                        msg += f" (deprecate_after={vdef.deprecate_after})"
+                    if vdef.replacement:
+                        msg += f" (replacement={vdef.replacement})"
+                    warnings.append(msg)
+                entries.append((k, v, source_path))
                 continue
-            if vdef.state == "deprecated":
-                msg = f"Deprecated contract key used in values file {source_path}: {k}"
-                if vdef.deprecate_after:
-                    msg += f" (deprecate_after={vdef.deprecate_after})"
-                if vdef.replacement:
-                    msg += f" (replacement={vdef.replacement})"
-                warnings.append(msg)
-            out[k] = v
-            continue
 
-        if k in rename_map:
-            new_key = rename_map[k]
-            if new_key in raw_values:
-                errors.append(
-                    f"Conflicting keys in values file {source_path}: both legacy {k} and new {new_key} are set. Remove {k}."
-                )
-                continue
-            vdef = vars_def.get(new_key)
-            if vdef is None:
-                errors.append(f"Legacy key {k} maps to unknown contract key {new_key}: {source_path}")
-                continue
-            if not applicable(vdef, env):
-                errors.append(f"Out-of-scope key in values file {source_path}: {k} -> {new_key} (env={env})")
+            new_key = rename_map_get(k)
+            if new_key is not None:
+                if new_key in raw_values:
+                    errors.append(
+                        f"Conflicting keys in values file {source_path}: both legacy {k} and new {new_key} are set. Remove {k}."
+                    )
+                    continue
+                vdef = vars_def_get(new_key)
+                if vdef is None:
+                    errors.append(f"Legacy key {k} maps to unknown contract key {new_key}: {source_path}")
+                    continue
+                if not applicable(vdef, env):
+                    errors.append(f"Out-of-scope key in values file {source_path}: {k} -> {new_key} (env={env})")
+                    continue
+                if vdef.state == "removed":
+                    errors.append(f"Legacy key {k} maps to removed contract key {new_key}: {source_path}")
+                    continue
+                if vdef.secret:
+                    errors.append(f"Values file must not include secret variable {k} (renamed to {new_key}): {source_path}")
+                    continue
+                warnings.append(f"Legacy key used in values file {source_path}: {k} -> {new_key} (migration.rename_from).")
+                entries.append((new_key, v, source_path))
                 continue
-            if vdef.state == "removed":
-                errors.append(f"Legacy key {k} maps to removed contract key {new_key}: {source_path}")
-                continue
-            if vdef.secret:
-                errors.append(f"Values file must not include secret variable {k} (renamed to {new_key}): {source_path}")
-                continue
-            warnings.append(f"Legacy key used in values file {source_path}: {k} -> {new_key} (migration.rename_from).")
-            out[new_key] = v
-            continue
 
-        errors.append(f"Unknown key in values file {source_path}: {k}")
+            errors.append(f"Unknown key in values file {source_path}: {k}")
 
-    return out, errors, warnings
+    return entries, errors, warnings
 
 
 def discover_envs(root: Path) -> List[str]:
     envs: set[str] = set()
-    values_dir = root / "env" / "values"
-    if values_dir.exists():
-        for p in values_dir.glob("*.yaml"):
-            envs.add(p.stem)
-    secrets_dir = root / "env" / "secrets"
-    if secrets_dir.exists():
-        for p in secrets_dir.glob("*.ref.yaml"):
-            envs.add(p.name.replace(".ref.yaml", ""))
-    inventory_dir = root / "env" / "inventory"
-    if inventory_dir.exists():
-        for p in inventory_dir.glob("*.yaml"):
-            envs.add(p.stem)
+    env_dir = root / "env"
+    # One scandir pass per directory; names are filtered as strings (no Path/stat per entry).
+    for sub, suffix in (("values", ".yaml"), ("secrets", ".ref.yaml"), ("inventory", ".yaml")):
+        try:
+            it = os.scandir(env_dir / sub)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        cut = len(suffix)
+        with it:
+            for entry in it:
+                n = entry.name
+                if len(n) > cut and n.endswith(suffix):
+                    envs.add(n[:-cut])
     return sorted(envs)
 
 
 def load_values_file(path: Path) -> Tuple[Dict[str, Any], List[str]]:
-    if not path.exists():
-        return {}, []
     try:
         data = load_yaml(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return {}, []
     except Exception as e:
         return {}, [f"Failed to parse values file {path}: {e}"]
     if data is None:
@@ -911,8 +1313,9 @@ def load_values_file(path: Path) -> Tuple[Dict[str, Any], List[str]]:
         return {}, [f"Values file {path} must be a mapping"]
     out: Dict[str, Any] = {}
     errors: List[str] = []
+    is_env_var = ENV_VAR_RE.fullmatch
     for k, v in data.items():
-        if not isinstance(k, str) or not ENV_VAR_RE.match(k):
+        if not isinstance(k, str) or not is_env_var(k):
             errors.append(f"Invalid key in values file {path}: {k!r}")
             continue
         out[k] = v
@@ -920,10 +1323,10 @@ def load_values_file(path: Path) -> Tuple[Dict[str, Any], List[str]]:
 
 
 def load_secrets_ref(path: Path) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
-    if not path.exists():
-        return {}, [f"Missing secret ref file: {path}"]
     try:
         data = load_yaml(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return {}, [f"Missing secret ref file: {path}"]
     except Exception as e:
         return {}, [f"Failed to parse secrets ref {path}: {e}"]
 
@@ -967,29 +1370,145 @@ def applicable(v: VarDef, env: str) -> bool:
     return v.scopes is None or env in v.scopes
 
 
-def type_check_value(v: VarDef, value: Any) -> Optional[str]:
-    t = v.type
-    if t == "string":
-        return None if isinstance(value, str) else "expected string"
-    if t == "url":
-        return None if isinstance(value, str) else "expected url string"
-    if t == "int":
-        return None if isinstance(value, int) and not isinstance(value, bool) else "expected int"
-    if t == "float":
-        return None if isinstance(value, (int, float)) and not isinstance(value, bool) else "expected float"
-    if t == "bool":
-        return None if isinstance(value, bool) else "expected bool"
-    if t == "json":
-        return None if isinstance(value, (dict, list, str, int, float, bool)) else "expected json-like"
-    if t == "enum":
-        if not isinstance(value, str):
-            return "expected enum string"
-        if v.enum and value not in v.enum:
-            return f"expected one of {v.enum}"
-        return None
+@dataclass(frozen=True)
+class PartitionedVars:
+    """Contract variables active for one env (applicable, not removed), in contract order."""
+
+    non_secret: List[Tuple[str, VarDef]]
+    secrets: List[Tuple[str, VarDef]]
+    required: List[Tuple[str, VarDef]]
+    secret_refs: FrozenSet[str]
+    # name -> type checker already bound to its VarDef (active non-secret vars only).
+    checkers: Dict[str, Callable[[Any], Optional[str]]]
+
+
+def partition_vars(vars_def: Mapping[str, VarDef], env: str) -> PartitionedVars:
+    """Filter on scope/state once so the per-env loops need no further branching."""
+    non_secret: List[Tuple[str, VarDef]] = []
+    secrets: List[Tuple[str, VarDef]] = []
+    required: List[Tuple[str, VarDef]] = []
+    checkers: Dict[str, Callable[[Any], Optional[str]]] = {}
+    for name, vdef in vars_def.items():
+        if vdef.state == "removed" or not applicable(vdef, env):
+            continue
+        if vdef.secret:
+            secrets.append((name, vdef))
+        else:
+            non_secret.append((name, vdef))
+            checkers[name] = functools.partial(_TYPE_CHECKERS.get(vdef.type, _check_any), vdef)
+        if vdef.required:
+            required.append((name, vdef))
+    return PartitionedVars(
+        non_secret=non_secret,
+        secrets=secrets,
+        required=required,
+        secret_refs=frozenset(v.secret_ref for _, v in secrets if v.secret_ref),
+        checkers=checkers,
+    )
+
+
+def _check_string(v: VarDef, value: Any) -> Optional[str]:
+    return None if isinstance(value, str) else "expected string"
+
+
+def _check_url(v: VarDef, value: Any) -> Optional[str]:
+    return None if isinstance(value, str) else "expected url string"
+
+
+def _check_int(v: VarDef, value: Any) -> Optional[str]:
+    return None if isinstance(value, int) and not isinstance(value, bool) else "expected int"
+
+
+def _check_float(v: VarDef, value: Any) -> Optional[str]:
+    return None if isinstance(value, (int, float)) and not isinstance(value, bool) else "expected float"
+
+
+def _check_bool(v: VarDef, value: Any) -> Optional[str]:
+    return None if isinstance(value, bool) else "expected bool"
+
+
+def _check_json(v: VarDef, value: Any) -> Optional[str]:
+    return None if isinstance(value, (dict, list, str, int, float, bool)) else "expected json-like"
+
+
+def _check_enum(v: VarDef, value: Any) -> Optional[str]:
+    if not isinstance(value, str):
+        return "expected enum string"
+    if v.enum and value not in v.enum:
+        return f"expected one of {v.enum}"
+    return None
+
+
+def _check_any(v: VarDef, value: Any) -> Optional[str]:
     return None
 
 
+# One dict lookup per value instead of a chain of string comparisons; keys mirror ALLOWED_TYPES.
+_TYPE_CHECKERS: Dict[str, Callable[[VarDef, Any], Optional[str]]] = {
+    "string": _check_string,
+    "url": _check_url,
+    "int": _check_int,
+    "float": _check_float,
+    "bool": _check_bool,
+    "json": _check_json,
+    "enum": _check_enum,
+}
+
+
+@functools.lru_cache(maxsize=512)
+def _read_secret_file(abs_path: str, mtime_ns: int, size: int) -> str:
+    # Keyed like _load_yaml_cached; values stay in process memory only.
+    # Allow multiline but strip trailing newlines to keep .env stable.
+    return read_text(Path(abs_path)).rstrip("\n")
+
+
+def _try_read_secret_file(path: Path) -> Optional[str]:
+    """Read a secret file once per (path, mtime, size), or return None if it does not exist.
+
+    A path component that is a regular file (ENOTDIR) counts as missing, as `exists()` did.
+    """
+    try:
+        st = path.stat()
+        return _read_secret_file(str(path), st.st_mtime_ns, st.st_size)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+@dataclass(frozen=True)
+class EnvPaths:
+    """Per-env input/output locations under the project root."""
+
+    values: Path
+    local_values: Path
+    secrets_ref: Path
+    secrets_store: Path
+    env_file: Path
+    ctx: Path
+
+
+@functools.lru_cache(maxsize=8)
+def env_paths(root: Path, env: str) -> EnvPaths:
+    """Build every per-env path once; commands and helpers share the cached instance."""
+    env_dir = root / "env"
+    return EnvPaths(
+        values=env_dir.joinpath("values", f"{env}.yaml"),
+        local_values=env_dir.joinpath("values", f"{env}.local.yaml"),
+        secrets_ref=env_dir.joinpath("secrets", f"{env}.ref.yaml"),
+        secrets_store=env_dir.joinpath(".secrets-store", env),
+        env_file=root / envfile_name_for(env),
+        ctx=root.joinpath("docs", "context", "env", f"effective-{env}.json"),
+    )
+
+
+# Mock store entries whose presence one directory listing can decide on any filesystem.
+_MOCK_PLAIN_NAME_RE = re.compile(r"[A-Za-z0-9_-]+(?:\.[A-Za-z0-9_-]+)*")
+
+
+def _mock_store_path(root: Path, env: str, secret_name: str) -> Path:
+    # env/.secrets-store/<env>/<name>
+    return env_paths(root, env).secrets_store / secret_name
+
+
 def resolve_secret(
     root: Path,
     env: str,
@@ -1003,13 +1522,11 @@ def resolve_secret(
     ref = str(secret_cfg.get("ref", "")).strip()
 
     if backend == "mock":
-        # Read from env/.secrets-store/<env>/<name>
-        store_path = root / "env" / ".secrets-store" / env / secret_name
-        if not store_path.exists():
+        store_path = _mock_store_path(root, env, secret_name)
+        val = _try_read_secret_file(store_path.absolute())
+        if val is None:
             return None, f"mock secret missing: create {store_path}"
-        val = read_text(store_path)
-        # Allow multiline but strip trailing newlines to keep .env stable.
-        return val.rstrip("\n"), None
+        return val, None
 
     if backend == "env":
         # Supported ref forms: env://VAR or env:VAR
@@ -1039,10 +1556,10 @@ def resolve_secret(
         path = Path(p)
         if not path.is_absolute():
             path = (root / path).resolve()
-        if not path.exists():
+        val = _try_read_secret_file(path)
+        if val is None:
             return None, f"file secret missing: {path}"
-        val = read_text(path)
-        return val.rstrip("\n"), None
+        return val, None
 
     if backend == "bws":
         # Bitwarden Secrets Manager (bws CLI).
@@ -1054,32 +1571,16 @@ def resolve_secret(
         #
         # Alternative compact ref form:
         #   ref: "bws://<PROJECT_ID>?key=<SECRET_KEY>"
-        cfg = _apply_bws_defaults(secret_cfg, policy_bws or {})
-        project_id = cfg.get("project_id")
-        project_name = cfg.get("project_name")
-        key = cfg.get("key")
-
-        if (not project_id or not isinstance(project_id, str)) and ref.startswith("bws://"):
-            u = urlparse(ref)
-            project_id = u.netloc
-            q = parse_qs(u.query or "")
-            k = q.get("key", [None])[0]
-            if isinstance(k, str) and k.strip():
-                key = k.strip()
-
-        if not isinstance(key, str) or not key.strip():
+        pid, project_name, key = _bws_locate(secret_cfg, policy_bws)
+        if key is None:
             return None, "bws backend requires secret_cfg.key (or ref like bws://<PROJECT_ID>?key=<SECRET_KEY>)"
-        key = key.strip()
 
-        pid: Optional[str] = None
-        if isinstance(project_id, str) and project_id.strip():
-            pid = project_id.strip()
-        elif isinstance(project_name, str) and project_name.strip():
+        if pid is None:
+            if project_name is None:
+                return None, "bws backend requires secret_cfg.project_id or secret_cfg.project_name"
             pid, err = _bws_project_id_by_name(project_name)
             if err:
                 return None, err
-        else:
-            return None, "bws backend requires secret_cfg.project_id or secret_cfg.project_name"
 
         secrets, err = _bws_secrets_for_project(pid or "")
         if err:
@@ -1091,63 +1592,351 @@ def resolve_secret(
     return None, f"unsupported secret backend: {backend!r} (supported: mock, env, file, bws)"
 
 
-def redact_effective(vars_def: Mapping[str, VarDef], effective: Mapping[str, Any]) -> Dict[str, Any]:
-    out: Dict[str, Any] = {}
-    for k, v in effective.items():
-        var_def = vars_def.get(k)
-        if var_def and var_def.secret:
-            out[k] = "***REDACTED***"
-        else:
-            out[k] = v
+def resolve_secrets_bulk(
+    root: Path,
+    env: str,
+    refs: Iterable[str],
+    secrets_ref: Mapping[str, Any],
+    *,
+    policy_bws: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+    """Resolve each distinct secret ref once; returns ref -> (value, error).
+
+    bws projects are prefetched together, and mock refs are checked against one directory
+    listing of env/.secrets-store/<env>/ so absent files cost no open() each.
+    """
+    unique = [r for r in dict.fromkeys(refs) if isinstance(secrets_ref.get(r), dict)]
+    _bws_prefetch_for_refs(secrets_ref, unique, policy_bws=policy_bws)
+
+    mock_names: Optional[Set[str]] = None
+    if any(str(secrets_ref[r].get("backend", "")).strip() == "mock" for r in unique):
+        mock_names = set()
+        try:
+            with os.scandir(env_paths(root, env).secrets_store) as it:
+                for entry in it:
+                    # Directories are listed too: nested names like "db/password" resolve below them.
+                    # Casefolded, since the store may live on a case-insensitive filesystem.
+                    mock_names.add(entry.name.casefold())
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+
+    out: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+    for ref in unique:
+        cfg = secrets_ref[ref]
+        head = ref.split("/", 1)[0]
+        # Only plain ASCII names are decided from the listing; anything else (`..`, `x.`,
+        # non-ASCII, ...) may still open, so resolve_secret() gets the final say.
+        if (
+            mock_names is not None
+            and str(cfg.get("backend", "")).strip() == "mock"
+            and _MOCK_PLAIN_NAME_RE.fullmatch(head)
+            and head.casefold() not in mock_names
+        ):
+            out[ref] = None, f"mock secret missing: create {_mock_store_path(root, env, ref)}"
+            continue
+        out[ref] = resolve_secret(root, env, ref, cfg, policy_bws=policy_bws)
     return out
 
 
+@dataclass
+class EffectiveResult:
+    """Outcome of resolving one env; `effective` may hold secret values and must never be printed."""
+
+    effective: Dict[str, Any]
+    vars_def: Dict[str, VarDef]
+    contract_errors: List[str]
+    gate_errors: List[str]  # SSOT mode gate
+    errors: List[str]  # contract, values files, secrets ref and values type checks
+    default_errors: List[str]  # contract defaults failing their own type (doctor only)
+    missing: List[str]  # secrets that could not be resolved
+    missing_required: List[str]  # doctor: required keys not already listed in `missing`
+    unset_required: List[str]  # compile: every required key absent or empty in `effective`
+    warnings: List[str]
+    secrets_ref: Dict[str, Any]
+    values: Dict[str, Any]  # canonical values after the local overlay
+    value_origin: Dict[str, Path]  # canonical key -> values file it came from
+
+
+def _resolve_env(
+    root: Path,
+    env: str,
+    *,
+    policy_path: Path,
+    resolve_secrets: bool,
+) -> EffectiveResult:
+    """Mode gate, contract, values overlays, secrets and required-key check, shared by all commands.
+
+    With resolve_secrets=False (doctor) secrets are still resolved to prove availability, but
+    their values are discarded instead of being placed in `effective`.
+    Each kind of finding is kept in its own list (ordered, without duplicates) because the
+    commands surface different subsets: doctor all of them, compile the gate, `errors`,
+    `missing` and `unset_required`, connectivity only `errors` and `missing`.
+    """
+    errors: List[str] = []
+    gate_errors: List[str] = []
+    default_errors: List[str] = []
+    missing: Dict[str, None] = {}  # insertion-ordered set
+    missing_required: Dict[str, None] = {}
+    missing_names: Set[str] = set()
+    empty_secrets: Set[str] = set()
+    warnings: List[str] = []
+
+    if get_ssot_mode(root) != "repo-env-contract":
+        gate_errors.append("SSOT mode gate failed: docs/project/env-ssot.json must set mode=repo-env-contract")
+
+    vars_def, contract_errors, rename_map = parse_contract(root)
+    errors.extend(contract_errors)
+
+    paths = env_paths(root, env)
+    values_path = paths.values
+    local_values_path = paths.local_values
+    values, v_err = load_values_file(values_path)
+    local_values, lv_err = load_values_file(local_values_path)
+    errors.extend(v_err)
+    errors.extend(lv_err)
+
+    # One canonicalize pass over both files; local overrides win.
+    entries, c_err, c_warn = canonicalize_values_sources(
+        vars_def,
+        ((values, values_path), (local_values, local_values_path)),
+        env=env,
+        rename_map=rename_map,
+    )
+    errors.extend(c_err)
+    warnings.extend(c_warn)
+
+    secrets_ref, s_err = load_secrets_ref(paths.secrets_ref)
+    errors.extend(s_err)
+    policy_bws = load_policy_bws_defaults(policy_path)
+    parts = partition_vars(vars_def, env)
+
+    effective: Dict[str, Any] = {}
+    from_default: Set[str] = set()
+
+    # Defaults first (non-secret only).
+    for name, vdef in parts.non_secret:
+        if vdef.default is not None:
+            effective[name] = vdef.default
+            from_default.add(name)
+
+    # Overlay values (canonicalized keys are always active non-secret contract vars).
+    # Every file's value is type-checked, including ones the local file overrides, so a bad
+    # committed value fails for everyone; the last valid value wins.
+    merged: Dict[str, Any] = {}
+    origin: Dict[str, Path] = {}
+    checkers_get = parts.checkers.get
+    for k, v, src_path in entries:
+        merged[k] = v
+        origin[k] = src_path
+        check = checkers_get(k)
+        if check is None:
+            continue
+        t_err = check(v)
+        if t_err:
+            errors.append(f"Type check failed for {k} in {src_path}: {t_err}")
+            continue
+        effective[k] = v
+        from_default.discard(k)
+
+    # Defaults that survived the overlay are effective values too (contract order).
+    for name, _vdef in parts.non_secret:
+        if name not in from_default:
+            continue
+        t_err = parts.checkers[name](effective[name])
+        if t_err:
+            default_errors.append(f"Type check failed for {name} (contract default): {t_err}")
+
+    # Resolve secrets (each distinct ref once).
+    resolved = resolve_secrets_bulk(root, env, parts.secret_refs, secrets_ref, policy_bws=policy_bws)
+    for name, vdef in parts.secrets:
+        if not vdef.secret_ref:
+            missing[f"{name} (missing secret_ref in contract)"] = None
+            missing_names.add(name)
+            continue
+        if vdef.secret_ref not in resolved:
+            missing[f"{name} (missing secret ref entry: {vdef.secret_ref} in env/secrets/{env}.ref.yaml)"] = None
+            missing_names.add(name)
+            continue
+        val, err = resolved[vdef.secret_ref]
+        if err:
+            missing[f"{name} (secret material unavailable: {err})"] = None
+            missing_names.add(name)
+            continue
+        if val in (None, ""):
+            empty_secrets.add(name)
+        if resolve_secrets:
+            effective[name] = val
+
+    # Ensure required keys (secrets already reported above are not repeated).
+    unset_required: List[str] = []
+    for name, vdef in parts.required:
+        if effective.get(name) in (None, ""):
+            unset_required.append(f"{name} (required but missing)")
+        if name in missing_names:
+            continue
+        if vdef.secret:
+            if name in empty_secrets:
+                missing_required[f"{name} (required secret resolved to an empty value)"] = None
+            continue
+        if effective.get(name) in (None, ""):
+            missing_required[
+                f"{name} (required; provide in env/values/{env}.yaml or env/values/{env}.local.yaml or contract default)"
+            ] = None
+
+    # Strongly prefer env selector to match.
+    if "APP_ENV" in vars_def and applicable(vars_def["APP_ENV"], env) and vars_def["APP_ENV"].state != "removed":
+        effective["APP_ENV"] = env
+
+    return EffectiveResult(
+        effective=effective,
+        vars_def=vars_def,
+        contract_errors=contract_errors,
+        gate_errors=gate_errors,
+        errors=errors,
+        default_errors=default_errors,
+        missing=list(missing),
+        missing_required=list(missing_required),
+        unset_required=unset_required,
+        warnings=warnings,
+        secrets_ref=secrets_ref,
+        values=merged,
+        value_origin=origin,
+    )
+
+
+def redact_effective(vars_def: Mapping[str, VarDef], effective: Mapping[str, Any]) -> Dict[str, Any]:
+    secret_keys = frozenset(n for n, v in vars_def.items() if v.secret)
+    return {k: ("***REDACTED***" if k in secret_keys else v) for k, v in effective.items()}
+
+
 def envfile_name_for(env: str) -> str:
     return ".env.local" if env == "dev" else f".env.{env}.local"
 
 
+def _render_env_value(v: Any) -> str:
+    if isinstance(v, bool):
+        return "true" if v else "false"
+    if v is None:
+        return ""
+    if isinstance(v, (dict, list)):
+        return _dumps_compact(v)
+    return str(v)
+
+
+def _env_file_body(path: Path) -> Optional[bytes]:
+    """Return the KEY=value body of an env file written by write_env_file, or None."""
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    if not data.startswith(b"# Generated by env-localctl."):
+        return None
+    _header, sep, body = data.partition(_native_newlines(b"\n\n"))
+    return body if sep else None
+
+
 def write_env_file(path: Path, kv: Mapping[str, Any]) -> None:
-    lines: List[str] = []
-    lines.append("# Generated by env-localctl. Do not hand-edit; regenerate via env_localctl.py compile")
-    lines.append(f"# Generated at: {utc_now_iso()}")
-    lines.append("")
-    for k in sorted(kv.keys()):
-        v = kv[k]
-        # Render scalars.
-        if isinstance(v, bool):
-            s = "true" if v else "false"
-        elif v is None:
-            s = ""
-        elif isinstance(v, (dict, list)):
-            s = json.dumps(v, separators=(",", ":"), ensure_ascii=False)
-        else:
-            s = str(v)
-        lines.append(f"{k}={s}")
-    content = "\n".join(lines) + "\n"
+    # Encode straight into one buffer: no intermediate list of lines or joined string.
+    body = bytearray()
+    for k in sorted(kv):
+        body += f"{k}={_render_env_value(kv[k])}\n".encode("utf-8")
+    body = _native_newlines(body)
+
+    mode = stat.S_IRUSR | stat.S_IWUSR
+    # Same body on disk: keep the file (and its mtime) as is. Hand edits still differ and get rewritten.
+    if _env_file_body(path) == body:
+        try:
+            if stat.S_IMODE(path.stat().st_mode) != mode:
+                path.chmod(mode)
+        except Exception:
+            # Best-effort; may fail on some FS.
+            pass
+        return
+
+    buf = bytearray(
+        (
+            "# Generated by env-localctl. Do not hand-edit; regenerate via env_localctl.py compile\n"
+            f"# Generated at: {utc_now_iso()}\n"
+            "\n"
+        ).encode("utf-8")
+    )
+    buf = _native_newlines(buf)
+    buf += body
+
+    # Create with 0600 directly so secret values are never readable by others, even briefly.
+    fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    with os.fdopen(fd, "wb") as fh:
+        # The create mode does not apply to a pre-existing file; tighten it too.
+        try:
+            if hasattr(os, "fchmod"):
+                os.fchmod(fh.fileno(), mode)
+            else:
+                path.chmod(mode)
+        except Exception:
+            # Best-effort; may fail on some FS.
+            pass
+        fh.write(buf)
 
-    path.write_text(content, encoding="utf-8")
 
-    # chmod 600
+def _ctx_unchanged(path: Path, env: str, values: Mapping[str, Any]) -> bool:
+    """True when the effective-context file already holds exactly these redacted values."""
     try:
-        path.chmod(stat.S_IRUSR | stat.S_IWUSR)
-    except Exception:
-        # Best-effort; may fail on some FS.
-        pass
+        data = path.read_bytes()
+        prev = _loads_json_bytes(data)
+    except (OSError, ValueError):
+        return False
+    if not isinstance(prev, dict) or not isinstance(prev.get("generated_at_utc"), str):
+        return False
+    # Compare bytes, not objects: `1 == True == 1.0` in Python but not in the written JSON.
+    doc = {"generated_at_utc": prev["generated_at_utc"], "env": env, "values": values}
+    return _native_newlines(_dumps_pretty_bytes(doc)) == data
 
 
 def tcp_check(host: str, port: int, timeout_s: float) -> Tuple[bool, str]:
-    start = time.time()
+    start = time.monotonic_ns()
     try:
         sock = socket.create_connection((host, port), timeout=timeout_s)
         sock.close()
-        ms = int((time.time() - start) * 1000)
+        ms = (time.monotonic_ns() - start) // 1_000_000
         return True, f"reachable ({ms}ms)"
     except Exception as e:  # noqa: BLE001
         return False, str(e)
 
 
-def connectivity_report(vars_def: Mapping[str, VarDef], effective: Mapping[str, Any], env: str) -> Dict[str, Any]:
+DEFAULT_TCP_TIMEOUT_S = 1.5
+_TCP_MAX_WORKERS = 16
+
+
+def _positive_seconds(value: str) -> float:
+    """argparse type for --timeout: a finite number of seconds greater than zero."""
+    try:
+        seconds = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number of seconds: {value!r}")
+    # `not seconds > 0` also rejects NaN.
+    if not seconds > 0 or seconds == float("inf"):
+        raise argparse.ArgumentTypeError(f"must be a positive number of seconds, got {value!r}")
+    return seconds
+
+
+def _run_tcp_check(task: Tuple[Dict[str, Any], str, int], timeout_s: float) -> None:
+    # Runs in a worker thread; each task owns its entry dict, so no locking is needed.
+    entry, host, port = task
+    ok, msg = tcp_check(host, port, timeout_s=timeout_s)
+    entry["status"] = "PASS" if ok else "FAIL"
+    entry["details"] = {"host": host, "port": port, "result": msg}
+
+
+def connectivity_report(
+    vars_def: Mapping[str, VarDef],
+    effective: Mapping[str, Any],
+    env: str,
+    *,
+    timeout_s: float = DEFAULT_TCP_TIMEOUT_S,
+) -> Dict[str, Any]:
     results: Dict[str, Any] = {"env": env, "timestamp_utc": utc_now_iso(), "checks": []}
+    # TCP probes are collected first and run concurrently; entries keep contract order.
+    tcp_tasks: List[Tuple[Dict[str, Any], str, int]] = []
 
     for name, vdef in vars_def.items():
         if not applicable(vdef, env):
@@ -1191,110 +1980,198 @@ def connectivity_report(vars_def: Mapping[str, VarDef], effective: Mapping[str,
 
         # Network-style URLs: best-effort TCP check if host/port present.
         host = parsed.hostname
-        port = parsed.port
+        try:
+            port = parsed.port
+        except ValueError as e:
+            entry["status"] = "FAIL"
+            entry["details"] = {"error": f"invalid port: {e}"}
+            results["checks"].append(entry)
+            continue
         if host and port:
-            ok, msg = tcp_check(host, int(port), timeout_s=1.5)
-            entry["status"] = "PASS" if ok else "FAIL"
-            entry["details"] = {"host": host, "port": int(port), "result": msg}
+            tcp_tasks.append((entry, host, int(port)))
         else:
             entry["status"] = "SKIP"
             entry["details"] = {"note": "No host/port to TCP-check; parsed only."}
 
         results["checks"].append(entry)
 
+    if tcp_tasks:
+        # Each probe has its own timeout, so the batch takes ~max(RTT) rather than the sum.
+        with ThreadPoolExecutor(max_workers=min(_TCP_MAX_WORKERS, len(tcp_tasks))) as ex:
+            list(ex.map(functools.partial(_run_tcp_check, timeout_s=timeout_s), tcp_tasks))
+
     return results
 
 
-def render_markdown_doctor(summary: Mapping[str, Any]) -> str:
-    lines: List[str] = []
-    lines.append("# Local Environment Doctor")
-    lines.append("")
-    lines.append(f"- Timestamp (UTC): `{summary.get('timestamp_utc')}`")
-    lines.append(f"- Env: `{summary.get('env')}`")
-    if summary.get("runtime_target"):
-        lines.append(f"- Runtime target: `{summary.get('runtime_target')}`")
-    if summary.get("workload"):
-        lines.append(f"- Workload: `{summary.get('workload')}`")
-    lines.append(f"- Status: **{summary.get('status')}**")
-    lines.append("")
-
-    if summary.get("errors"):
-        lines.append("## Errors")
-        for e in summary["errors"]:
-            lines.append(f"- {e}")
-        lines.append("")
-
-    if summary.get("warnings"):
-        lines.append("## Warnings")
-        for w in summary["warnings"]:
-            lines.append(f"- {w}")
-        lines.append("")
-
-    if summary.get("actions"):
-        lines.append("## Next actions (minimal entry points)")
-        for a in summary["actions"]:
-            lines.append(f"- {a}")
-        lines.append("")
-
-    lines.append("## Details (redacted)")
-    lines.append("```json")
-    lines.append(json.dumps(summary, indent=2, sort_keys=True, ensure_ascii=False))
-    lines.append("```")
-    lines.append("")
-    lines.append("## Notes")
-    lines.append("- Do not paste secret values into chat.")
-    lines.append("- Evidence files must not include secret values.")
-    return "\n".join(lines) + "\n"
-
-
-def render_markdown_compile(report: Mapping[str, Any]) -> str:
-    lines: List[str] = []
-    lines.append("# Local Environment Compile Report")
-    lines.append("")
-    lines.append(f"- Timestamp (UTC): `{report.get('timestamp_utc')}`")
-    lines.append(f"- Env: `{report.get('env')}`")
-    if report.get("runtime_target"):
-        lines.append(f"- Runtime target: `{report.get('runtime_target')}`")
-    if report.get("workload"):
-        lines.append(f"- Workload: `{report.get('workload')}`")
-    lines.append(f"- Status: **{report.get('status')}**")
-    lines.append(f"- Env file: `{report.get('env_file')}`")
-    lines.append(f"- Effective context: `{report.get('effective_context')}`")
-    lines.append("")
-
-    missing = list(report.get("missing") or [])
-    errors = list(report.get("errors") or [])
-    warnings = list(report.get("warnings") or [])
-    missing_set = set(missing)
-    extra_errors = [e for e in errors if e not in missing_set]
-
-    if extra_errors:
-        lines.append("## Errors")
-        for e in extra_errors:
-            lines.append(f"- {e}")
-        lines.append("")
-
-    if missing:
-        lines.append("## Missing requirements")
-        for k in missing:
-            lines.append(f"- {k}")
-        lines.append("")
-
-    if warnings:
-        lines.append("## Warnings")
-        for w in warnings:
-            lines.append(f"- {w}")
-        lines.append("")
-
-    lines.append("## Key summary (redacted)")
-    lines.append("```json")
-    lines.append(json.dumps(report.get("keys"), indent=2, sort_keys=True, ensure_ascii=False))
-    lines.append("```")
-    lines.append("")
-    lines.append("## Notes")
-    lines.append("- Secret values are written only to the local env file.")
-    lines.append("- Do not commit the local env file.")
-    return "\n".join(lines) + "\n"
+def _md_section(title: str, items: Iterable[Any]) -> str:
+    """Render `## title` followed by one bullet per item, or "" when there are no items."""
+    body = "".join(f"- {i}\n" for i in items)
+    return f"## {title}\n{body}\n" if body else ""
+
+
+def _md_opt(label: str, value: Any) -> str:
+    return f"- {label}: `{value}`\n" if value else ""
+
+
+_DOCTOR_MD_TMPL = """# Local Environment Doctor
+
+- Timestamp (UTC): `{ts}`
+- Env: `{env}`
+{runtime_target}{workload}- Status: **{status}**
+
+{errors}{warnings}{actions}## Details (redacted)
+```json
+{details}
+```
+
+## Notes
+- Do not paste secret values into chat.
+- Evidence files must not include secret values.
+"""
+
+
+def _md_parts(tmpl: str, details: Any, **fields: Any) -> Tuple[str, bytes, str]:
+    """Split a report into (head, JSON details as bytes, tail) around the `{details}` slot.
+
+    The JSON is encoded once as bytes so file writers can emit it without an intermediate str.
+    """
+    head, _, tail = tmpl.partition("{details}\n")
+    return head.format(**fields), _dumps_pretty_bytes(details), tail
+
+
+def _join_md_parts(parts: Tuple[str, bytes, str]) -> str:
+    head, details, tail = parts
+    return head + details.decode("utf-8") + tail
+
+
+def _write_md_parts(parts: Tuple[str, bytes, str], write: Callable[[bytes], Any]) -> None:
+    head, details, tail = parts
+    write(head.encode("utf-8"))
+    write(details)
+    write(tail.encode("utf-8"))
+
+
+def write_markdown(path: Path, parts: Tuple[str, bytes, str]) -> None:
+    ensure_dirs(path)
+    with path.open("wb") as fh:
+        if _NATIVE_NEWLINE == b"\n":
+            _write_md_parts(parts, fh.write)
+        else:
+            _write_md_parts(parts, lambda data: fh.write(_native_newlines(data)))
+
+
+def print_markdown(parts: Tuple[str, bytes, str]) -> None:
+    """Stream a report to stdout part by part; same bytes as print() of the joined report."""
+    buf = getattr(sys.stdout, "buffer", None)
+    encoding = (getattr(sys.stdout, "encoding", None) or "").lower().replace("-", "").replace("_", "")
+    if buf is None or encoding != "utf8" or _NATIVE_NEWLINE != b"\n":
+        # Non-UTF-8 consoles, a replaced sys.stdout and newline-translating platforms (CRLF on
+        # Windows) keep print()'s encoding and newline behaviour.
+        print(_join_md_parts(parts))
+        return
+    sys.stdout.flush()
+    _write_md_parts(parts, buf.write)
+    buf.write(b"\n")
+    buf.flush()
+
+
+def emit_markdown(out: Optional[Path], parts: Tuple[str, bytes, str]) -> None:
+    if out:
+        write_markdown(out, parts)
+    else:
+        print_markdown(parts)
+
+
+def _doctor_md_parts(summary: Mapping[str, Any]) -> Tuple[str, bytes, str]:
+    return _md_parts(
+        _DOCTOR_MD_TMPL,
+        summary,
+        ts=summary.get("timestamp_utc"),
+        env=summary.get("env"),
+        runtime_target=_md_opt("Runtime target", summary.get("runtime_target")),
+        workload=_md_opt("Workload", summary.get("workload")),
+        status=summary.get("status"),
+        errors=_md_section("Errors", summary.get("errors") or ()),
+        warnings=_md_section("Warnings", summary.get("warnings") or ()),
+        actions=_md_section("Next actions (minimal entry points)", summary.get("actions") or ()),
+    )
+
+
+_COMPILE_MD_TMPL = """# Local Environment Compile Report
+
+- Timestamp (UTC): `{ts}`
+- Env: `{env}`
+{runtime_target}{workload}- Status: **{status}**
+- Env file: `{env_file}`
+- Effective context: `{effective_context}`
+
+{errors}{missing}{warnings}## Key summary (redacted)
+```json
+{details}
+```
+
+## Notes
+- Secret values are written only to the local env file.
+- Do not commit the local env file.
+"""
+
+
+def _compile_md_parts(report: Mapping[str, Any]) -> Tuple[str, bytes, str]:
+    return _md_parts(
+        _COMPILE_MD_TMPL,
+        report.get("keys"),
+        ts=report.get("timestamp_utc"),
+        env=report.get("env"),
+        runtime_target=_md_opt("Runtime target", report.get("runtime_target")),
+        workload=_md_opt("Workload", report.get("workload")),
+        status=report.get("status"),
+        env_file=report.get("env_file"),
+        effective_context=report.get("effective_context"),
+        errors=_md_section("Errors", report.get("errors") or ()),
+        missing=_md_section("Missing requirements", report.get("missing") or ()),
+        warnings=_md_section("Warnings", report.get("warnings") or ()),
+    )
+
+
+_CONNECTIVITY_MD_TMPL = """# Connectivity Smoke
+
+- Timestamp (UTC): `{ts}`
+- Env: `{env}`
+- Runtime target: `{runtime_target}`
+- Workload: `{workload}`
+- Status: **{status}**
+
+{errors}{warnings}## Details (redacted)
+```json
+{details}
+```
+
+## Notes
+- Secret values are not printed.
+"""
+
+
+def _connectivity_md_parts(
+    report: Mapping[str, Any],
+    *,
+    env: str,
+    runtime_target: str,
+    workload: str,
+    status: str,
+    errors: Sequence[str],
+    warnings: Sequence[str],
+) -> Tuple[str, bytes, str]:
+    return _md_parts(
+        _CONNECTIVITY_MD_TMPL,
+        report,
+        ts=report.get("timestamp_utc"),
+        env=env,
+        runtime_target=runtime_target,
+        workload=workload,
+        status=status,
+        errors=_md_section("Errors", errors),
+        warnings=_md_section("Warnings", warnings),
+    )
 
 
 def ensure_dirs(path: Path) -> None:
@@ -1380,90 +2257,29 @@ def cmd_doctor(
     workload: str,
     policy_path: Path,
     no_preflight: bool,
+    resolved: Optional[EffectiveResult] = None,
+    preflight_result: Optional[Tuple[Optional[Dict[str, Any]], List[str], List[str]]] = None,
 ) -> int:
     ts = utc_now_iso()
 
-    mode = get_ssot_mode(root)
-    errors: List[str] = []
-    warnings: List[str] = []
+    res = resolved if resolved is not None else _resolve_env(root, env, policy_path=policy_path, resolve_secrets=False)
+    errors = res.gate_errors + res.errors + res.default_errors
+    warnings = list(res.warnings)
     actions: List[str] = []
-
-    if mode != "repo-env-contract":
-        errors.append("SSOT mode gate failed: docs/project/env-ssot.json must set mode=repo-env-contract")
-
-    vars_def, contract_errors = parse_contract(root)
-    errors.extend(contract_errors)
-
-    values_path = root / "env" / "values" / f"{env}.yaml"
-    local_values_path = root / "env" / "values" / f"{env}.local.yaml"
-    values, v_err = load_values_file(values_path)
-    local_values, lv_err = load_values_file(local_values_path)
-    errors.extend(v_err)
-    errors.extend(lv_err)
-
-    values, v_err2, v_warn2 = canonicalize_values_for_env(vars_def, values, env=env, source_path=values_path)
-    local_values, lv_err2, lv_warn2 = canonicalize_values_for_env(vars_def, local_values, env=env, source_path=local_values_path)
-    errors.extend(v_err2)
-    errors.extend(lv_err2)
-    warnings.extend(v_warn2)
-    warnings.extend(lv_warn2)
-
-    secrets_ref, s_err = load_secrets_ref(root / "env" / "secrets" / f"{env}.ref.yaml")
-    errors.extend(s_err)
-    policy_bws = load_policy_bws_defaults(policy_path)
-
-    missing_required: List[str] = []
-
-    # Build a partial effective map without materializing secrets.
-    for name, vdef in vars_def.items():
-        if not applicable(vdef, env):
-            continue
-        if vdef.state == "removed":
-            continue
-
-        if vdef.secret:
-            # Need a ref and resolvable secret material.
-            if not vdef.secret_ref:
-                missing_required.append(f"{name} (secret_ref missing in contract)")
-                continue
-            ref_cfg = secrets_ref.get(vdef.secret_ref)
-            if ref_cfg is None:
-                missing_required.append(f"{name} (missing secret ref entry: {vdef.secret_ref} in env/secrets/{env}.ref.yaml)")
-                continue
-            # Try resolve but do not store in report.
-            _val, err = resolve_secret(root, env, vdef.secret_ref, ref_cfg, policy_bws=policy_bws)
-            if err:
-                missing_required.append(f"{name} (secret material unavailable: {err})")
-            continue
-
-        # Non-secret: default or value.
-        value: Any
-        if name in local_values:
-            value = local_values[name]
-        elif name in values:
-            value = values[name]
-        else:
-            value = vdef.default
-
-        if vdef.required and (value is None or value == ""):
-            missing_required.append(f"{name} (required; provide in env/values/{env}.yaml or env/values/{env}.local.yaml or contract default)")
-            continue
-
-        if value is not None:
-            err = type_check_value(vdef, value)
-            if err:
-                errors.append(f"Type check failed for {name}: {err}")
-
-    if missing_required:
-        errors.extend(missing_required)
-
-    preflight, pf_warns, pf_errs = run_preflight(
-        root=root,
-        env=env,
-        runtime_target=runtime_target,
-        workload=workload,
-        policy_path=policy_path,
-        no_preflight=no_preflight,
+    missing_required = res.missing + res.missing_required
+    errors.extend(missing_required)
+
+    preflight, pf_warns, pf_errs = (
+        preflight_result
+        if preflight_result is not None
+        else run_preflight(
+            root=root,
+            env=env,
+            runtime_target=runtime_target,
+            workload=workload,
+            policy_path=policy_path,
+            no_preflight=no_preflight,
+        )
     )
     warnings.extend(pf_warns)
     errors.extend(pf_errs)
@@ -1488,12 +2304,7 @@ def cmd_doctor(
         "preflight": preflight,
     }
 
-    md = render_markdown_doctor(summary)
-    if out:
-        ensure_dirs(out)
-        out.write_text(md, encoding="utf-8")
-    else:
-        print(md)
+    emit_markdown(out, _doctor_md_parts(summary))
 
     return 0 if status == "PASS" else 1
 
@@ -1510,120 +2321,43 @@ def cmd_compile(
     workload: str,
     policy_path: Path,
     no_preflight: bool,
+    resolved: Optional[EffectiveResult] = None,
+    preflight_result: Optional[Tuple[Optional[Dict[str, Any]], List[str], List[str]]] = None,
+    strict: bool = False,
 ) -> int:
     ts = utc_now_iso()
-    errors: List[str] = []
-    missing: List[str] = []
-    warnings: List[str] = []
-
-    mode = get_ssot_mode(root)
-    if mode != "repo-env-contract":
-        errors.append("SSOT mode gate failed: docs/project/env-ssot.json must set mode=repo-env-contract")
-
-    vars_def, contract_errors = parse_contract(root)
-    errors.extend(contract_errors)
-
-    values_path = root / "env" / "values" / f"{env}.yaml"
-    local_values_path = root / "env" / "values" / f"{env}.local.yaml"
-    values, v_err = load_values_file(values_path)
-    local_values, lv_err = load_values_file(local_values_path)
-    errors.extend(v_err)
-    errors.extend(lv_err)
-
-    values, v_err2, v_warn2 = canonicalize_values_for_env(vars_def, values, env=env, source_path=values_path)
-    local_values, lv_err2, lv_warn2 = canonicalize_values_for_env(vars_def, local_values, env=env, source_path=local_values_path)
-    errors.extend(v_err2)
-    errors.extend(lv_err2)
-    warnings.extend(v_warn2)
-    warnings.extend(lv_warn2)
-
-    secrets_ref, s_err = load_secrets_ref(root / "env" / "secrets" / f"{env}.ref.yaml")
-    errors.extend(s_err)
-    policy_bws = load_policy_bws_defaults(policy_path)
-
-    effective: Dict[str, Any] = {}
-
-    # Defaults first (non-secret only).
-    for name, vdef in vars_def.items():
-        if not applicable(vdef, env):
-            continue
-        if vdef.state == "removed":
-            continue
-        if vdef.secret:
-            continue
-        if vdef.default is not None:
-            effective[name] = vdef.default
-
-    # Overlay values.
-    for src, src_path in ((values, values_path), (local_values, local_values_path)):
-        for k, v in src.items():
-            vdef = vars_def.get(k)
-            if vdef is None:
-                continue
-            t_err = type_check_value(vdef, v)
-            if t_err:
-                errors.append(f"Type check failed for {k} in {src_path}: {t_err}")
-                continue
-            effective[k] = v
-
-    # Resolve secrets.
-    for name, vdef in vars_def.items():
-        if not applicable(vdef, env):
-            continue
-        if vdef.state == "removed":
-            continue
-        if not vdef.secret:
-            continue
-        if not vdef.secret_ref:
-            missing.append(f"{name} (missing secret_ref in contract)")
-            continue
-        ref_cfg = secrets_ref.get(vdef.secret_ref)
-        if ref_cfg is None:
-            missing.append(f"{name} (missing secret ref entry: {vdef.secret_ref} in env/secrets/{env}.ref.yaml)")
-            continue
-        val, err = resolve_secret(root, env, vdef.secret_ref, ref_cfg, policy_bws=policy_bws)
-        if err:
-            missing.append(f"{name} (secret material unavailable: {err})")
-            continue
-        effective[name] = val
-
-    # Ensure required keys.
-    for name, vdef in vars_def.items():
-        if not applicable(vdef, env):
-            continue
-        if vdef.state == "removed":
-            continue
-        if not vdef.required:
-            continue
-        if name not in effective or effective[name] in (None, ""):
-            missing.append(f"{name} (required but missing)")
-
-    if missing:
-        errors.extend(missing)
-
-    # Strongly prefer env selector to match.
-    if "APP_ENV" in vars_def and applicable(vars_def["APP_ENV"], env) and vars_def["APP_ENV"].state != "removed":
-        effective["APP_ENV"] = env
-
-    preflight, pf_warns, pf_errs = run_preflight(
-        root=root,
-        env=env,
-        runtime_target=runtime_target,
-        workload=workload,
-        policy_path=policy_path,
-        no_preflight=no_preflight,
+    res = resolved if resolved is not None else _resolve_env(root, env, policy_path=policy_path, resolve_secrets=True)
+    vars_def = res.vars_def
+    effective = res.effective
+    errors = res.gate_errors + res.errors
+    if strict:
+        errors.extend(res.default_errors)
+    warnings = list(res.warnings)
+    missing = res.missing + res.unset_required
+
+    preflight, pf_warns, pf_errs = (
+        preflight_result
+        if preflight_result is not None
+        else run_preflight(
+            root=root,
+            env=env,
+            runtime_target=runtime_target,
+            workload=workload,
+            policy_path=policy_path,
+            no_preflight=no_preflight,
+        )
     )
     warnings.extend(pf_warns)
     errors.extend(pf_errs)
 
-    status = "PASS" if not errors else "FAIL"
+    status = "PASS" if not errors and not missing else "FAIL"
 
-    env_file_name = envfile_name_for(env)
-    env_file_path = env_file if env_file is not None else root / env_file_name
+    paths = env_paths(root, env)
+    env_file_path = env_file if env_file is not None else paths.env_file
     if env_file_path and not env_file_path.is_absolute():
         env_file_path = (root / env_file_path).resolve()
 
-    ctx_path = None if no_context else root / "docs" / "context" / "env" / f"effective-{env}.json"
+    ctx_path = None if no_context else paths.ctx
 
     keys_summary: Dict[str, Any] = {}
     for k in sorted(effective.keys()):
@@ -1653,20 +2387,18 @@ def cmd_compile(
         if not no_write:
             write_env_file(env_file_path, effective)
         if ctx_path is not None:
-            ensure_dirs(ctx_path)
-            redacted = {
-                "generated_at_utc": ts,
-                "env": env,
-                "values": redact_effective(vars_def, effective),
-            }
-            ctx_path.write_text(json.dumps(redacted, indent=2, sort_keys=True, ensure_ascii=False) + "\n", encoding="utf-8")
-
-    md = render_markdown_compile(report)
-    if out:
-        ensure_dirs(out)
-        out.write_text(md, encoding="utf-8")
-    else:
-        print(md)
+            redacted_values = redact_effective(vars_def, effective)
+            # Keep the previous file (and its generated_at_utc) when nothing changed.
+            if not _ctx_unchanged(ctx_path, env, redacted_values):
+                ensure_dirs(ctx_path)
+                redacted = {
+                    "generated_at_utc": ts,
+                    "env": env,
+                    "values": redacted_values,
+                }
+                ctx_path.write_bytes(_native_newlines(_dumps_pretty_bytes(redacted)))
+
+    emit_markdown(out, _compile_md_parts(report))
 
     return 0 if status == "PASS" else 1
 
@@ -1680,17 +2412,19 @@ def cmd_connectivity(
     workload: str,
     policy_path: Path,
     no_preflight: bool,
+    resolved: Optional[EffectiveResult] = None,
+    preflight_result: Optional[Tuple[Optional[Dict[str, Any]], List[str], List[str]]] = None,
+    timeout_s: float = DEFAULT_TCP_TIMEOUT_S,
+    strict: bool = False,
 ) -> int:
-    # Use compile's effective env resolution but do not write env file.
-    # We'll re-run compile logic with no_write and capture effective values.
-
-    vars_def, contract_errors = parse_contract(root)
-    if contract_errors:
+    # Same resolution as compile; unresolved inputs are reported, nothing is written.
+    res = resolved if resolved is not None else _resolve_env(root, env, policy_path=policy_path, resolve_secrets=True)
+    if res.contract_errors:
         summary = {
             "timestamp_utc": utc_now_iso(),
             "env": env,
             "status": "FAIL",
-            "errors": contract_errors,
+            "errors": res.contract_errors,
         }
         md = "# Connectivity Smoke\n\n" + json.dumps(summary, indent=2, ensure_ascii=False) + "\n"
         if out:
@@ -1700,70 +2434,66 @@ def cmd_connectivity(
             print(md)
         return 1
 
-    # Reuse compile internals by building effective map in-memory.
-    values_path = root / "env" / "values" / f"{env}.yaml"
-    local_values_path = root / "env" / "values" / f"{env}.local.yaml"
-    values, v_err = load_values_file(values_path)
-    local_values, lv_err = load_values_file(local_values_path)
-    secrets_ref, s_err = load_secrets_ref(root / "env" / "secrets" / f"{env}.ref.yaml")
-    policy_bws = load_policy_bws_defaults(policy_path)
-
-    errors: List[str] = []
-    warnings: List[str] = []
-    errors.extend(v_err)
-    errors.extend(lv_err)
-    errors.extend(s_err)
+    vars_def = res.vars_def
+    effective = res.effective
+    # --strict: the same gate, type and required-key checks doctor applies.
+    errors = res.gate_errors + res.errors + res.default_errors if strict else list(res.errors)
+    warnings = list(res.warnings)
+    errors.extend(res.missing)
+    if strict:
+        errors.extend(res.missing_required)
+
+    preflight, pf_warns, pf_errs = (
+        preflight_result
+        if preflight_result is not None
+        else run_preflight(
+            root=root,
+            env=env,
+            runtime_target=runtime_target,
+            workload=workload,
+            policy_path=policy_path,
+            no_preflight=no_preflight,
+        )
+    )
+    warnings.extend(pf_warns)
+    errors.extend(pf_errs)
 
-    values, v_err2, v_warn2 = canonicalize_values_for_env(vars_def, values, env=env, source_path=values_path)
-    local_values, lv_err2, lv_warn2 = canonicalize_values_for_env(vars_def, local_values, env=env, source_path=local_values_path)
-    errors.extend(v_err2)
-    errors.extend(lv_err2)
-    warnings.extend(v_warn2)
-    warnings.extend(lv_warn2)
+    report = connectivity_report(vars_def, effective, env, timeout_s=timeout_s)
+    report["preflight"] = preflight
+    status = "PASS" if not errors and all(c.get("status") in {"PASS", "SKIP"} for c in report.get("checks", [])) else "FAIL"
 
-    effective: Dict[str, Any] = {}
-    for name, vdef in vars_def.items():
-        if not applicable(vdef, env):
-            continue
-        if vdef.state == "removed":
-            continue
-        if vdef.secret:
-            continue
-        if vdef.default is not None:
-            effective[name] = vdef.default
+    parts = _connectivity_md_parts(
+        report,
+        env=env,
+        runtime_target=runtime_target,
+        workload=workload,
+        status=status,
+        errors=errors,
+        warnings=warnings,
+    )
+    emit_markdown(out, parts)
 
-    for src in (values, local_values):
-        for k, v in src.items():
-            vdef = vars_def.get(k)
-            if vdef is None:
-                continue
-            if vdef.secret or not applicable(vdef, env) or vdef.state == "removed":
-                continue
-            t_err = type_check_value(vdef, v)
-            if t_err:
-                errors.append(f"Type check failed for {k}: {t_err}")
-                continue
-            effective[k] = v
+    return 0 if status == "PASS" else 1
 
-    for name, vdef in vars_def.items():
-        if not applicable(vdef, env):
-            continue
-        if vdef.state == "removed":
-            continue
-        if not vdef.secret:
-            continue
-        if not vdef.secret_ref:
-            continue
-        ref_cfg = secrets_ref.get(vdef.secret_ref)
-        if not ref_cfg:
-            continue
-        val, err = resolve_secret(root, env, vdef.secret_ref, ref_cfg, policy_bws=policy_bws)
-        if err:
-            errors.append(f"Secret unresolved for connectivity check: {name} ({err})")
-            continue
-        effective[name] = val
 
-    preflight, pf_warns, pf_errs = run_preflight(
+def cmd_all(
+    root: Path,
+    env: str,
+    out_dir: Optional[Path],
+    *,
+    no_write: bool = False,
+    env_file: Optional[Path] = None,
+    no_context: bool = False,
+    runtime_target: str,
+    workload: str,
+    policy_path: Path,
+    no_preflight: bool,
+    timeout_s: float = DEFAULT_TCP_TIMEOUT_S,
+    strict: bool = False,
+) -> int:
+    """doctor + compile + connectivity in one process, sharing one env resolution and one preflight."""
+    res = _resolve_env(root, env, policy_path=policy_path, resolve_secrets=True)
+    pf = run_preflight(
         root=root,
         env=env,
         runtime_target=runtime_target,
@@ -1771,53 +2501,47 @@ def cmd_connectivity(
         policy_path=policy_path,
         no_preflight=no_preflight,
     )
-    warnings.extend(pf_warns)
-    errors.extend(pf_errs)
-
-    report = connectivity_report(vars_def, effective, env)
-    report["preflight"] = preflight
-    status = "PASS" if not errors and all(c.get("status") in {"PASS", "SKIP"} for c in report.get("checks", [])) else "FAIL"
+    common: Dict[str, Any] = {
+        "runtime_target": runtime_target,
+        "workload": workload,
+        "policy_path": policy_path,
+        "no_preflight": no_preflight,
+        "resolved": res,
+        "preflight_result": pf,
+    }
 
-    md_lines: List[str] = []
-    md_lines.append("# Connectivity Smoke")
-    md_lines.append("")
-    md_lines.append(f"- Timestamp (UTC): `{report.get('timestamp_utc')}`")
-    md_lines.append(f"- Env: `{env}`")
-    md_lines.append(f"- Runtime target: `{runtime_target}`")
-    md_lines.append(f"- Workload: `{workload}`")
-    md_lines.append(f"- Status: **{status}**")
-    md_lines.append("")
-    if errors:
-        md_lines.append("## Errors")
-        for e in errors:
-            md_lines.append(f"- {e}")
-        md_lines.append("")
-    if warnings:
-        md_lines.append("## Warnings")
-        for w in warnings:
-            md_lines.append(f"- {w}")
-        md_lines.append("")
-
-    md_lines.append("## Details (redacted)")
-    md_lines.append("```json")
-    md_lines.append(json.dumps(report, indent=2, sort_keys=True, ensure_ascii=False))
-    md_lines.append("```")
-    md_lines.append("")
-    md_lines.append("## Notes")
-    md_lines.append("- Secret values are not printed.")
-
-    md = "\n".join(md_lines) + "\n"
-    if out:
-        ensure_dirs(out)
-        out.write_text(md, encoding="utf-8")
-    else:
-        print(md)
+    def _out(name: str) -> Optional[Path]:
+        return out_dir / name if out_dir is not None else None
 
-    return 0 if status == "PASS" else 1
+    rcs = [
+        cmd_doctor(root, env, _out("00-prereq-check.md"), **common),
+        cmd_compile(
+            root,
+            env,
+            _out("02-config-compile-report.md"),
+            no_write=no_write,
+            env_file=env_file,
+            no_context=no_context,
+            strict=strict,
+            **common,
+        ),
+        cmd_connectivity(root, env, _out("03-connectivity-smoke.md"), timeout_s=timeout_s, strict=strict, **common),
+    ]
+    return 0 if not any(rcs) else 1
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Local env controller (repo-env-contract)")
+    parser.add_argument(
+        "--debug-cache",
+        action="store_true",
+        help="Print parse cache statistics to stderr (in-process caches, plus the --cache-dir disk cache when enabled)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Reuse parsed YAML across runs via JSON files in this directory (or set ENV_LOCALCTL_CACHE_DIR)",
+    )
     sub = parser.add_subparsers(dest="cmd", required=True)
 
     p_doc = sub.add_parser("doctor", help="Diagnose local env readiness and missing inputs.")
@@ -1840,6 +2564,7 @@ def main() -> int:
     p_comp.add_argument("--no-context", action="store_true", help="Do not write docs/context/env/effective-<env>.json")
     p_comp.add_argument("--out", default=None, help="Write markdown report to file")
     p_comp.add_argument("--no-write", action="store_true", help="Do not write env file (still writes redacted context on PASS)")
+    p_comp.add_argument("--strict", action="store_true", help="Also fail on contract defaults that do not match their type (as doctor does)")
 
     p_conn = sub.add_parser("connectivity", help="Best-effort connectivity smoke checks (redacted).")
     p_conn.add_argument("--root", default=".", help="Project root")
@@ -1849,9 +2574,46 @@ def main() -> int:
     p_conn.add_argument("--policy", default="docs/project/policy.yaml", help="Policy file path")
     p_conn.add_argument("--no-preflight", action="store_true", help="Disable policy preflight checks")
     p_conn.add_argument("--out", default=None, help="Write markdown report to file")
+    p_conn.add_argument(
+        "--strict",
+        action="store_true",
+        help="Also apply doctor's SSOT mode gate, required-key and contract default type checks",
+    )
+    p_conn.add_argument(
+        "--timeout",
+        type=_positive_seconds,
+        default=DEFAULT_TCP_TIMEOUT_S,
+        help=f"Per-check TCP connect timeout in seconds (default: {DEFAULT_TCP_TIMEOUT_S})",
+    )
+
+    p_all = sub.add_parser("all", help="Run doctor, compile and connectivity in one process (shared resolution).")
+    p_all.add_argument("--root", default=".", help="Project root")
+    p_all.add_argument("--env", default="dev", help="Environment name (default: dev)")
+    p_all.add_argument("--runtime-target", default="local", help="Runtime target (default: local; supports: local|ecs, 'remote' is alias)")
+    p_all.add_argument("--workload", default="api", help="Workload name (default: api)")
+    p_all.add_argument("--policy", default="docs/project/policy.yaml", help="Policy file path")
+    p_all.add_argument("--no-preflight", action="store_true", help="Disable policy preflight checks")
+    p_all.add_argument("--env-file", default=None, help="Override output env file path")
+    p_all.add_argument("--no-context", action="store_true", help="Do not write docs/context/env/effective-<env>.json")
+    p_all.add_argument("--no-write", action="store_true", help="Do not write env file (still writes redacted context on PASS)")
+    p_all.add_argument("--strict", action="store_true", help="Run compile and connectivity with --strict")
+    p_all.add_argument(
+        "--out-dir",
+        default=None,
+        help="Write 00-prereq-check.md, 02-config-compile-report.md and 03-connectivity-smoke.md here",
+    )
+    p_all.add_argument(
+        "--timeout",
+        type=_positive_seconds,
+        default=DEFAULT_TCP_TIMEOUT_S,
+        help=f"Per-check TCP connect timeout in seconds (default: {DEFAULT_TCP_TIMEOUT_S})",
+    )
 
     args = parser.parse_args()
     root = Path(args.root).resolve()
+    cache_dir = args.cache_dir or os.getenv("ENV_LOCALCTL_CACHE_DIR", "").strip()
+    if cache_dir:
+        set_yaml_json_cache_dir(Path(cache_dir).expanduser().resolve())
     out = Path(args.out).resolve() if getattr(args, "out", None) else None
 
     def _resolve_policy(p: str) -> Path:
@@ -1862,8 +2624,9 @@ def main() -> int:
 
     runtime_target = normalize_runtime_target(args.runtime_target)
 
+    rc = 1
     if args.cmd == "doctor":
-        return cmd_doctor(
+        rc = cmd_doctor(
             root,
             args.env,
             out,
@@ -1872,9 +2635,9 @@ def main() -> int:
             policy_path=_resolve_policy(args.policy),
             no_preflight=bool(args.no_preflight),
         )
-    if args.cmd == "compile":
+    elif args.cmd == "compile":
         env_file = Path(args.env_file) if args.env_file else None
-        return cmd_compile(
+        rc = cmd_compile(
             root,
             args.env,
             out,
@@ -1885,9 +2648,10 @@ def main() -> int:
             workload=args.workload,
             policy_path=_resolve_policy(args.policy),
             no_preflight=bool(args.no_preflight),
+            strict=bool(args.strict),
         )
-    if args.cmd == "connectivity":
-        return cmd_connectivity(
+    elif args.cmd == "connectivity":
+        rc = cmd_connectivity(
             root,
             args.env,
             out,
@@ -1895,10 +2659,43 @@ def main() -> int:
             workload=args.workload,
             policy_path=_resolve_policy(args.policy),
             no_preflight=bool(args.no_preflight),
+            timeout_s=args.timeout,
+            strict=bool(args.strict),
         )
-
-    print(f"Unknown command: {args.cmd}", file=sys.stderr)
-    return 1
+    elif args.cmd == "all":
+        env_file = Path(args.env_file) if args.env_file else None
+        rc = cmd_all(
+            root,
+            args.env,
+            Path(args.out_dir).resolve() if args.out_dir else None,
+            no_write=bool(args.no_write),
+            env_file=env_file,
+            no_context=bool(args.no_context),
+            runtime_target=runtime_target,
+            workload=args.workload,
+            policy_path=_resolve_policy(args.policy),
+            no_preflight=bool(args.no_preflight),
+            timeout_s=args.timeout,
+            strict=bool(args.strict),
+        )
+    else:
+        print(f"Unknown command: {args.cmd}", file=sys.stderr)
+
+    if args.debug_cache:
+        for label, fn in (("yaml", _load_yaml_cached), ("contract", _parse_contract_cached)):
+            info = fn.cache_info()
+            print(
+                f"[debug-cache] {label} (in-process): hits={info.hits} misses={info.misses} size={info.currsize}/{info.maxsize}",
+                file=sys.stderr,
+            )
+        # Only in-process misses consult the disk cache, so these count separately.
+        if _YAML_JSON_CACHE_DIR is not None:
+            print(
+                f"[debug-cache] yaml (disk {_YAML_JSON_CACHE_DIR}): hits={_YAML_JSON_CACHE_STATS['hits']} "
+                f"misses={_YAML_JSON_CACHE_STATS['misses']}",
+                file=sys.stderr,
+            )
+    return rc
 
 
 if __name__ == "__main__":
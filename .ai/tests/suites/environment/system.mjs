@@ -124,6 +124,32 @@ export function run(ctx) {
   }
   assertNotIncludes(readUtf8(paths.effectiveDev), 'dev-secret', 'Effective dev context leaked secret');
 
+  // A re-run must restore drifted outputs, not just skip because nothing upstream changed.
+  const withoutTimestamp = (text) => text.replace(/^# Generated at: .*$/m, '');
+  const envLocalBefore = readUtf8(paths.envLocal);
+  const effectiveBefore = JSON.parse(readUtf8(paths.effectiveDev));
+  fs.writeFileSync(paths.envLocal, `${envLocalBefore.replace(/^DATABASE_URL=.*$/m, 'DATABASE_URL=tampered')}EXTRA_DRIFT=1\n`);
+  fs.writeFileSync(
+    paths.effectiveDev,
+    `${JSON.stringify({ ...effectiveBefore, values: { ...effectiveBefore.values, DRIFT: true } }, null, 2)}\n`
+  );
+  const recompile = runCommand({
+    cmd: python.cmd,
+    args: [...python.argsPrefix, '-B', '-S', scripts.localctl, 'compile', '--root', rootDir, '--env', 'dev', '--out', compileMd],
+    evidenceDir: testDir,
+    label: `${name}.localctl.recompile`,
+  });
+  if (recompile.error || recompile.code !== 0) {
+    const detail = recompile.error ? String(recompile.error) : recompile.stderr || recompile.stdout;
+    return { name, status: 'FAIL', error: `env-localctl compile (re-run) failed: ${detail}` };
+  }
+  if (withoutTimestamp(readUtf8(paths.envLocal)) !== withoutTimestamp(envLocalBefore)) {
+    return { name, status: 'FAIL', error: 'compile re-run did not restore a hand-edited .env.local' };
+  }
+  if (JSON.stringify(JSON.parse(readUtf8(paths.effectiveDev)).values) !== JSON.stringify(effectiveBefore.values)) {
+    return { name, status: 'FAIL', error: 'compile re-run did not restore a hand-edited effective-dev.json' };
+  }
+
   const connectivityMd = `${rootDir}/connectivity.md`;
   const connectivity = runCommand({
     cmd: python.cmd,
@@ -139,6 +165,75 @@ export function run(ctx) {
   assertIncludes(connectivityText, 'Status: **PASS**', 'Expected PASS in connectivity.md');
   assertNotIncludes(connectivityText, 'dev-secret', 'Connectivity output leaked secret');
 
+  const allOutDir = path.join(rootDir, 'all-evidence');
+  const all = runCommand({
+    cmd: python.cmd,
+    args: [...python.argsPrefix, '-B', '-S', scripts.localctl, 'all', '--root', rootDir, '--env', 'dev', '--out-dir', allOutDir],
+    evidenceDir: testDir,
+    label: `${name}.localctl.all`,
+  });
+  if (all.error || all.code !== 0) {
+    const detail = all.error ? String(all.error) : all.stderr || all.stdout;
+    return { name, status: 'FAIL', error: `env-localctl all failed: ${detail}` };
+  }
+  for (const evidenceName of ['00-prereq-check.md', '02-config-compile-report.md', '03-connectivity-smoke.md']) {
+    const evidencePath = path.join(allOutDir, evidenceName);
+    if (!fs.existsSync(evidencePath)) {
+      return { name, status: 'FAIL', error: `env-localctl all did not write ${evidenceName}` };
+    }
+    const evidenceText = readUtf8(evidencePath);
+    assertIncludes(evidenceText, 'Status: **PASS**', `Expected PASS in ${evidenceName}`);
+    assertNotIncludes(evidenceText, 'dev-secret', `${evidenceName} leaked secret`);
+  }
+
+  // Contract defaults are only type-checked by compile under --strict (doctor always checks them).
+  const contractPath = path.join(rootDir, 'env', 'contract.yaml');
+  const contractText = readUtf8(contractPath);
+  fs.writeFileSync(
+    contractPath,
+    `${contractText}  BAD_RATIO:\n    type: float\n    default: "abc"\n    description: Default that does not match its type.\n`
+  );
+  const lenientMd = `${rootDir}/compile-lenient.md`;
+  const lenient = runCommand({
+    cmd: python.cmd,
+    args: [...python.argsPrefix, '-B', '-S', scripts.localctl, 'compile', '--root', rootDir, '--env', 'dev', '--no-write', '--no-context', '--out', lenientMd],
+    evidenceDir: testDir,
+    label: `${name}.localctl.compile-lenient`,
+  });
+  if (lenient.error || lenient.code !== 0) {
+    const detail = lenient.error ? String(lenient.error) : lenient.stderr || lenient.stdout;
+    return { name, status: 'FAIL', error: `env-localctl compile (bad contract default) should PASS without --strict: ${detail}` };
+  }
+  const strictMd = `${rootDir}/compile-strict.md`;
+  const strict = runCommand({
+    cmd: python.cmd,
+    args: [...python.argsPrefix, '-B', '-S', scripts.localctl, 'compile', '--root', rootDir, '--env', 'dev', '--no-write', '--no-context', '--strict', '--out', strictMd],
+    evidenceDir: testDir,
+    label: `${name}.localctl.compile-strict`,
+  });
+  if (strict.error || strict.code !== 1 || !fs.existsSync(strictMd)) {
+    const detail = strict.error ? String(strict.error) : strict.stderr || strict.stdout;
+    return { name, status: 'FAIL', error: `env-localctl compile --strict should FAIL on a bad contract default: ${detail}` };
+  }
+  assertIncludes(readUtf8(strictMd), 'Type check failed for BAD_RATIO (contract default)', 'Expected contract default type error under --strict');
+  fs.writeFileSync(contractPath, contractText);
+
+  // A nested mock name under an existing secret file (ENOTDIR) is a missing secret, not a crash.
+  fs.writeFileSync(contractPath, readUtf8(contractPath).replace('secret_ref: api_key\n', 'secret_ref: api_key/nested\n'));
+  fs.appendFileSync(path.join(rootDir, 'env', 'secrets', 'dev.ref.yaml'), `  api_key/nested:\n    backend: mock\n    ref: "mock://dev/api_key/nested"\n`);
+  const nestedMd = `${rootDir}/doctor-nested.md`;
+  const nested = runCommand({
+    cmd: python.cmd,
+    args: [...python.argsPrefix, '-B', '-S', scripts.localctl, 'doctor', '--root', rootDir, '--env', 'dev', '--out', nestedMd],
+    evidenceDir: testDir,
+    label: `${name}.localctl.doctor-nested`,
+  });
+  if (nested.error || nested.code !== 1 || !fs.existsSync(nestedMd)) {
+    const detail = nested.error ? String(nested.error) : nested.stderr || nested.stdout;
+    return { name, status: 'FAIL', error: `env-localctl doctor (nested mock name) should report FAIL, got: ${detail}` };
+  }
+  assertIncludes(readUtf8(nestedMd), 'mock secret missing', 'Expected mock secret missing for nested mock name');
+
   ctx.log(`[${name}] PASS`);
   return { name, status: 'PASS' };
 }